@@ -13,15 +13,31 @@ import logging.handlers
 import socket
 import threading
 import signal
+import fcntl
 import configparser
 import traceback
 import glob
 import pwd
 import re
+import io
+import functools
+import secrets
 from pathlib import Path
 from enum import Enum
+from collections import namedtuple
 from PowerSourceDetection import PowerSourceDetector 
-from typing import Dict, List, Tuple, Set
+from typing import Any, Dict, FrozenSet, List, NamedTuple, Optional, Tuple, Set, Union
+
+# orjson is optional: faster (de)serialization on the IPC path, stdlib json otherwise.
+# Both decode bytes and raise a json.JSONDecodeError subclass on bad input.
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    _json_loads = json.loads
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode('utf-8')
 
 # Constants
 VERSION = "1.0"
@@ -30,6 +46,63 @@ LOG_PATH = "/var/log/AcerSenseDaemon.log"
 CONFIG_PATH = "/etc/AcerSenseDaemon/config.ini"
 PID_FILE = "/var/run/AcerSense-Daemon.pid"
 MODPROBE_CONFIG_PATH = "/etc/modprobe.d/linuwu-sense.conf"
+ACER_WMI_PATH = "/sys/module/linuwu_sense/drivers/platform:acer-wmi/acer-wmi"
+PLATFORM_PROFILE_PATH = "/sys/firmware/acpi/platform_profile"
+PLATFORM_PROFILE_CHOICES_PATH = "/sys/firmware/acpi/platform_profile_choices"
+
+# Profiles the cycle_profile hotkey steps through, in order
+_AC_CYCLE_PROFILES = ("quiet", "balanced", "balanced-performance")
+_BAT_CYCLE_PROFILES = ("low-power", "balanced")
+
+# Hyprlang line sourcing the AcerSense manager file
+_HYPR_SOURCE_LINE_RE = re.compile(r'source.*acersense\.conf')
+
+# Six-digit RGB hex color as sent by the GUI (e.g. "4287f5")
+_HEX6 = re.compile(r'\A[0-9a-fA-F]{6}\Z').fullmatch
+
+# Default user-editable Hyprland mode files, created once per user
+_BAT_TEMPLATE = (
+    b"# AcerSense - Battery Mode Settings\n"
+    b"# This file is automatically sourced when the device is on BATTERY power.\n"
+    b"# You can edit this file to customize visuals (Blur, Shadows, Animations) for power saving.\n"
+    b"\n"
+    b"decoration {\n"
+    b"    blur {\n"
+    b"        enabled = false\n"
+    b"    }\n"
+    b"    # drop_shadow = false\n"
+    b"}\n"
+    b"\n"
+    b"# Note: Window Opacity is managed dynamically by the AcerSense App slider.\n"
+)
+
+_CHARGE_TEMPLATE = (
+    b"# AcerSense - Charging/Performance Mode Settings\n"
+    b"# This file is automatically sourced when the device is PLUGGED IN.\n"
+    b"# You can edit this file to customize visuals (Blur, Shadows, Animations) for high performance.\n"
+    b"\n"
+    b"decoration {\n"
+    b"    blur {\n"
+    b"        enabled = true\n"
+    b"        size = 8\n"
+    b"        passes = 2\n"
+    b"    }\n"
+    b"    # drop_shadow = true\n"
+    b"}\n"
+    b"\n"
+    b"# Note: Window Opacity is managed dynamically by the AcerSense App slider.\n"
+)
+
+# Standard sysfs locations of the AC adapter "online" attribute
+_AC_ONLINE_CANDIDATES = (
+    "/sys/class/power_supply/AC/online",
+    "/sys/class/power_supply/ACAD/online",
+    "/sys/class/power_supply/ADP1/online",
+    "/sys/class/power_supply/AC0/online",
+)
+
+# Matches the driver parameter written by _set_modprobe_parameter
+_MODPROBE_PARAM_RE = re.compile(rb'(nitro_v4|predator_v4|enable_all)')
 
 # Check if running as root
 if os.geteuid() != 0:
@@ -52,27 +125,106 @@ file_handler = logging.handlers.RotatingFileHandler(
 file_handler.setFormatter(formatter)
 log.addHandler(file_handler)
 
+# Parsed config files keyed by (path, st_mtime_ns, st_size); at most two entries
+_CFG_CACHE = {}
+
+def _read_config(path: str) -> configparser.ConfigParser:
+    """Parse an INI file, reusing the last parse while its mtime and size are unchanged.
+    The returned parser is shared: callers must not modify it."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return configparser.ConfigParser()
+    key = (path, st.st_mtime_ns, st.st_size)
+    config = _CFG_CACHE.get(key)
+    if config is None:
+        config = configparser.ConfigParser()
+        config.read(path)
+        if len(_CFG_CACHE) >= 2:
+            _CFG_CACHE.clear()
+        _CFG_CACHE[key] = config
+    return config
+
+def _config_log_level(section) -> int:
+    """Logging level named by a [General] section's LogLevel key (INFO if missing or invalid)"""
+    level = getattr(logging, str(section.get('LogLevel', 'INFO')).upper(), None)
+    return level if isinstance(level, int) else logging.INFO
+
 class LaptopType(Enum):
     UNKNOWN = 0
     PREDATOR = 1
     NITRO = 2
 
+# Absolute paths of every Hyprland file AcerSense touches for one user
+HyprPaths = namedtuple('HyprPaths', 'dir acersense acersense_lua bat charge hyprland_conf hyprland_lua')
+
 class AcerSenseManager:
     """Manages all the daemon features"""
 
     MAX_RESTART_ATTEMPTS = 20
     RESTART_COUNTER_FILE = "/tmp/acersense_daemon_restart_attempts"
 
+    # Built-in defaults, used whenever config.ini does not override them
+    DEFAULT_AC_PROFILE = "balanced"
+    DEFAULT_BAT_PROFILE = "low-power"
+    DEFAULT_AC_ACTIVE_OPACITY = 0.97
+    DEFAULT_AC_INACTIVE_OPACITY = 0.95
+    DEFAULT_BAT_ACTIVE_OPACITY = 1.0
+    DEFAULT_BAT_INACTIVE_OPACITY = 1.0
+
+    # Profiles that get the AC (charge) visuals in Hyprland
+    _HIGH_PERF_PROFILES = frozenset({"balanced", "balanced-performance", "performance", "turbo"})
+    _USB_CHARGING_LEVELS = frozenset({0, 10, 20, 30})
+    _FOUR_ZONE_DIRECTIONS = frozenset({1, 2})
+
+    # Window in which back-to-back visual updates share a single hyprctl reload
+    HYPR_RELOAD_DEBOUNCE = 0.25
+
+    # How long a discovered Hyprland session is trusted before re-scanning /run/user
+    HYPR_INFO_TTL = 5.0
+    # Coalesce bursts of settings changes into one write of CONFIG_PATH
+    CONFIG_FLUSH_DELAY = 1.0
+    # How long a get_all_settings snapshot may be served to polling clients
+    SETTINGS_CACHE_TTL = 0.25
+
+    __slots__ = (
+        'disable_logs', 'event_callback', '_last_fan_speeds', '_last_power_change_time',
+        'laptop_type', 'base_path', 'has_four_zone_kb', 'current_modprobe_param',
+        'available_features', 'nos_active', 'previous_profile_for_nos', 'last_known_profile',
+        'default_ac_profile', 'default_bat_profile', 'hyprland_integration',
+        'ac_active_opacity', 'ac_inactive_opacity', 'bat_active_opacity', 'bat_inactive_opacity',
+        'power_monitor', '_feature_fds', '_ac_online_path', '_hypr_info_cache',
+        '_pwd_cache', '_hypr_paths_cache', '_aux_ready', '_pending_reload', '_reload_lock',
+        '_profile_choices', '_profile_choices_set',
+        '_config', '_config_lock', '_config_flush_timer', '_settings_cache',
+        '_driver_version', '_fan_rpm_paths', 'command_lock',
+    )
+
     def __init__(self):
         '''The initial init (i know very nice description)'''
         # 1. Load defaults first to get the DisableLogs preference
         self.disable_logs = False
+        self._config = configparser.ConfigParser()
+        self._config_lock = threading.Lock()
+        # Serializes state-changing client commands, which run on executor threads
+        self.command_lock = threading.RLock()
+        self._config_flush_timer = None
+        self._settings_cache = None # (monotonic timestamp, settings dict)
+        self._driver_version = None
+        self._fan_rpm_paths = None
         self._load_defaults()
         
         if not self.disable_logs:
             log.info(f"** Starting AcerSense daemon v{VERSION} **")
         
         self.event_callback = None  # Callback for async broadcast
+        self._feature_fds = {}
+        self._hypr_info_cache = (0.0, None)
+        self._pwd_cache = {}
+        self._hypr_paths_cache = {}
+        self._aux_ready = set()
+        self._pending_reload = None
+        self._reload_lock = threading.Lock()
         self._last_fan_speeds = (0, 0)
 
         # Check if linuwu_sense is installed
@@ -84,7 +236,9 @@ class AcerSenseManager:
         # 2. Wait for driver files to appear (wait_for_file logic)
         self._wait_for_driver_files(timeout=2.0)
         
-        self.laptop_type = self._detect_laptop_type()
+        # Single scan of the acer-wmi dir drives type, base path and keyboard detection
+        acer_wmi_entries = self._probe_acer_wmi()
+        self.laptop_type = self._detect_laptop_type(acer_wmi_entries)
 
         # If unknown laptop type detected, try restarting drivers (with limit)
         if self.laptop_type == LaptopType.UNKNOWN:
@@ -110,11 +264,18 @@ class AcerSenseManager:
             self._reset_restart_attempts()
         
         self.base_path = self._get_base_path()
-        self.has_four_zone_kb = self._check_four_zone_kb()
+        self.has_four_zone_kb = self._check_four_zone_kb(acer_wmi_entries)
         self.current_modprobe_param = self._detect_current_modprobe_param()
 
         # Available features set
         self.available_features = self._detect_available_features()
+        self._open_feature_fds()
+
+        # platform_profile_choices is fixed by firmware; read it once
+        self._profile_choices = ()
+        if "thermal_profile" in self.available_features:
+            self._profile_choices = tuple(self._read_file(PLATFORM_PROFILE_CHOICES_PATH).split())
+        self._profile_choices_set = frozenset(self._profile_choices)
         self.nos_active = False
         self.previous_profile_for_nos = None
         self._last_power_change_time = 0
@@ -130,6 +291,9 @@ class AcerSenseManager:
             log.error(f"CRITICAL: Base path does not exist: {self.base_path}")
             raise FileNotFoundError(f"Base path does not exist: {self.base_path}")
 
+        # Resolve the AC adapter attribute once instead of probing on every check
+        self._ac_online_path = next((p for p in _AC_ONLINE_CANDIDATES if os.path.exists(p)), None)
+
         # Read the initial real state to prevent race conditions on start
         self.last_known_profile = self.get_thermal_profile()
 
@@ -142,11 +306,10 @@ class AcerSenseManager:
         self.event_callback = callback
 
     def _is_ac_online(self) -> bool:
-        """Helper to check current power state using multiple standard sysfs paths"""
-        for p in ["/sys/class/power_supply/AC/online", "/sys/class/power_supply/ACAD/online", "/sys/class/power_supply/ADP1/online", "/sys/class/power_supply/AC0/online"]:
-            if os.path.exists(p) and self._read_file(p) == "1":
-                return True
-        return False
+        """Helper to check current power state using the resolved AC sysfs path"""
+        if not self._ac_online_path:
+            return False
+        return self._read_file(self._ac_online_path) == "1"
 
     def sync_full_state(self):
         """Atomic sync of all hardware states and side effects (Visuals, Power Optimizations)
@@ -190,6 +353,7 @@ class AcerSenseManager:
                 if not self.disable_logs:
                     log.info(f"Hardware profile change detected via Netlink: {self.last_known_profile} -> {current_profile}")
                 self.last_known_profile = current_profile
+                self._settings_cache = None
                 self._update_hyprland_visuals(current_profile)
                 self._apply_profile_optimizations(current_profile) # Added: Apply EPP/Turbo/WiFi on hardware button press
                 self._notify_event("thermal_profile_changed", {"profile": current_profile})
@@ -203,38 +367,63 @@ class AcerSenseManager:
 
     def _load_defaults(self):
         """Load default profile preferences and opacity settings from config"""
-        self.default_ac_profile = "balanced"
-        self.default_bat_profile = "low-power"
+        self.default_ac_profile = self.DEFAULT_AC_PROFILE
+        self.default_bat_profile = self.DEFAULT_BAT_PROFILE
         self.disable_logs = False
         
         # Opacity defaults
-        self.ac_active_opacity = 0.97
-        self.ac_inactive_opacity = 0.95
-        self.bat_active_opacity = 1.0
-        self.bat_inactive_opacity = 1.0
+        self.ac_active_opacity = self.DEFAULT_AC_ACTIVE_OPACITY
+        self.ac_inactive_opacity = self.DEFAULT_AC_INACTIVE_OPACITY
+        self.bat_active_opacity = self.DEFAULT_BAT_ACTIVE_OPACITY
+        self.bat_inactive_opacity = self.DEFAULT_BAT_INACTIVE_OPACITY
         
         try:
             if os.path.exists(CONFIG_PATH):
-                config = configparser.ConfigParser()
-                config.read(CONFIG_PATH)
+                # Parsed once; setters update this copy and flush it via _update_config
+                config = self._config
+                config.read_dict(_read_config(CONFIG_PATH))
                 if 'General' in config:
-                    self.default_ac_profile = config['General'].get('DefaultAcProfile', "balanced")
-                    self.default_bat_profile = config['General'].get('DefaultBatProfile', "low-power")
+                    self.default_ac_profile = config['General'].get('DefaultAcProfile', self.DEFAULT_AC_PROFILE)
+                    self.default_bat_profile = config['General'].get('DefaultBatProfile', self.DEFAULT_BAT_PROFILE)
                     self.hyprland_integration = config['General'].getboolean('HyprlandIntegration', fallback=False)
                     self.disable_logs = config['General'].getboolean('DisableLogs', fallback=False)
                     
-                    self.ac_active_opacity = config['General'].getfloat('AcActiveOpacity', 0.97)
-                    self.ac_inactive_opacity = config['General'].getfloat('AcInactiveOpacity', 0.95)
-                    self.bat_active_opacity = config['General'].getfloat('BatActiveOpacity', 1.0)
-                    self.bat_inactive_opacity = config['General'].getfloat('BatInactiveOpacity', 1.0)
+                    self.ac_active_opacity = config['General'].getfloat('AcActiveOpacity', self.DEFAULT_AC_ACTIVE_OPACITY)
+                    self.ac_inactive_opacity = config['General'].getfloat('AcInactiveOpacity', self.DEFAULT_AC_INACTIVE_OPACITY)
+                    self.bat_active_opacity = config['General'].getfloat('BatActiveOpacity', self.DEFAULT_BAT_ACTIVE_OPACITY)
+                    self.bat_inactive_opacity = config['General'].getfloat('BatInactiveOpacity', self.DEFAULT_BAT_INACTIVE_OPACITY)
                     
                     if self.disable_logs:
                         log.setLevel(logging.ERROR)
                     else:
-                        log.setLevel(logging.DEBUG)
+                        log.setLevel(_config_log_level(config['General']))
         except Exception as e:
             log.error(f"Failed to load defaults: {e}")
 
+    def _update_config(self, values: Dict[str, str]):
+        """Apply values to the in-memory [General] section and schedule a flush"""
+        self._settings_cache = None
+        with self._config_lock:
+            if 'General' not in self._config:
+                self._config['General'] = {}
+            self._config['General'].update(values)
+
+            if self._config_flush_timer is not None:
+                self._config_flush_timer.cancel()
+            self._config_flush_timer = threading.Timer(self.CONFIG_FLUSH_DELAY, self.flush_config)
+            self._config_flush_timer.daemon = True
+            self._config_flush_timer.start()
+
+    def flush_config(self) -> bool:
+        """Write the in-memory config to CONFIG_PATH atomically"""
+        with self._config_lock:
+            if self._config_flush_timer is not None:
+                self._config_flush_timer.cancel()
+                self._config_flush_timer = None
+            buf = io.StringIO()
+            self._config.write(buf)
+        return self._write_user_file_atomically(CONFIG_PATH, buf.getvalue(), 0, 0)
+
     def set_logging_state(self, disabled: bool) -> bool:
         """Enable or disable logging at runtime and save to config"""
         try:
@@ -254,21 +443,15 @@ class AcerSenseManager:
                 
                 log.error("Logging restricted to ERROR level and file cleared by user.")
             else:
-                log.setLevel(logging.DEBUG)
-                log.info("Logging set to DEBUG level by user.")
+                general = self._config['General'] if 'General' in self._config else {}
+                log.setLevel(_config_log_level(general))
+                log.info(f"Logging re-enabled by user at {logging.getLevelName(log.level)} level.")
             
             # Flush existing handlers to ensure the log level change is reflected immediately
             for handler in log.handlers:
                 handler.flush()
 
-            config = configparser.ConfigParser()
-            config.read(CONFIG_PATH)
-            if 'General' not in config:
-                config['General'] = {}
-            config['General']['DisableLogs'] = str(disabled)
-            
-            with open(CONFIG_PATH, 'w') as f:
-                config.write(f)
+            self._update_config({'DisableLogs': str(disabled)})
             return True
         except Exception as e:
             log.error(f"CRITICAL: Failed to set logging state: {e}\n{traceback.format_exc()}")
@@ -282,18 +465,12 @@ class AcerSenseManager:
             self.bat_active_opacity = bat_active
             self.bat_inactive_opacity = bat_inactive
             
-            config = configparser.ConfigParser()
-            config.read(CONFIG_PATH)
-            if 'General' not in config:
-                config['General'] = {}
-            
-            config['General']['AcActiveOpacity'] = str(ac_active)
-            config['General']['AcInactiveOpacity'] = str(ac_inactive)
-            config['General']['BatActiveOpacity'] = str(bat_active)
-            config['General']['BatInactiveOpacity'] = str(bat_inactive)
-            
-            with open(CONFIG_PATH, 'w') as f:
-                config.write(f)
+            self._update_config({
+                'AcActiveOpacity': str(ac_active),
+                'AcInactiveOpacity': str(ac_inactive),
+                'BatActiveOpacity': str(bat_active),
+                'BatInactiveOpacity': str(bat_inactive),
+            })
             
             log.info("Updated Hyprland opacity settings")
             # Apply immediately based on current profile
@@ -306,22 +483,14 @@ class AcerSenseManager:
     def set_default_profile_preference(self, source: str, profile: str) -> bool:
         """Set default profile for AC or Battery"""
         try:
-            config = configparser.ConfigParser()
-            config.read(CONFIG_PATH)
-            if 'General' not in config:
-                config['General'] = {}
-
             if source == "ac":
                 self.default_ac_profile = profile
-                config['General']['DefaultAcProfile'] = profile
+                self._update_config({'DefaultAcProfile': profile})
             elif source == "bat":
                 self.default_bat_profile = profile
-                config['General']['DefaultBatProfile'] = profile
+                self._update_config({'DefaultBatProfile': profile})
             else:
                 return False
-
-            with open(CONFIG_PATH, 'w') as f:
-                config.write(f)
             
             log.info(f"Updated default profile for {source} to {profile}")
             return True
@@ -333,13 +502,11 @@ class AcerSenseManager:
         """Applies the default thermal profile based on the current power source at startup."""
         log.info("Applying initial default thermal profile...")
         try:
-            is_ac_online_path = next((p for p in ["/sys/class/power_supply/AC/online", "/sys/class/power_supply/ACAD/online", "/sys/class/power_supply/ADP1/online", "/sys/class/power_supply/AC0/online"] if os.path.exists(p)), None)
-            is_ac = self._read_file(is_ac_online_path) == "1" if is_ac_online_path else False
+            is_ac = self._is_ac_online()
             
-            profile_list = self.get_thermal_profile_choices()
             target_profile = self.default_ac_profile if is_ac else self.default_bat_profile
 
-            if target_profile in profile_list:
+            if target_profile in self._profile_choices_set:
                 log.info(f"Setting initial default profile to: {target_profile}")
                 self.set_thermal_profile(target_profile)
             else:
@@ -374,12 +541,19 @@ class AcerSenseManager:
         """Increment and return restart attempt count"""
         attempts = self._get_restart_attempts() + 1
         try:
-            with open(self.RESTART_COUNTER_FILE, 'w') as f:
-                f.write(str(attempts))
-        except IOError as e:
+            self._write_tiny_file(self.RESTART_COUNTER_FILE, str(attempts).encode())
+        except OSError as e:
             log.error(f"Failed to write restart counter: {e}")
         return attempts
 
+    def _write_tiny_file(self, path: str, data: bytes):
+        """Write a small file with a single os.write, bypassing Python's buffered IO"""
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, data)
+        finally:
+            os.close(fd)
+
     def _reset_restart_attempts(self):
         """Reset restart attempt counter"""
         try:
@@ -479,15 +653,16 @@ class AcerSenseManager:
     def _detect_current_modprobe_param(self) -> str:
         """Detect which modprobe parameter is currently set"""
         try:
-            if os.path.exists(MODPROBE_CONFIG_PATH):
-                with open(MODPROBE_CONFIG_PATH, 'r') as f:
-                    content = f.read().strip().lower()
-                    if "nitro_v4" in content:
-                        return "nitro_v4"
-                    elif "predator_v4" in content:
-                        return "predator_v4"
-                    elif "enable_all" in content:
-                        return "enable_all"
+            fd = os.open(MODPROBE_CONFIG_PATH, os.O_RDONLY)
+            try:
+                content = os.read(fd, 4096).lower()
+            finally:
+                os.close(fd)
+            match = _MODPROBE_PARAM_RE.search(content)
+            if match:
+                return match.group(1).decode()
+        except FileNotFoundError:
+            pass
         except Exception as e:
             log.error(f"Failed to read modprobe config: {e}")
         return ""
@@ -499,8 +674,7 @@ class AcerSenseManager:
             os.makedirs(os.path.dirname(MODPROBE_CONFIG_PATH), exist_ok=True)
             
             # Write the config file
-            with open(MODPROBE_CONFIG_PATH, 'w') as f:
-                f.write(f"options linuwu_sense {param}=1\n")
+            self._write_tiny_file(MODPROBE_CONFIG_PATH, f"options linuwu_sense {param}=1\n".encode())
             
             log.info(f"Set modprobe parameter: {param}")
             self.current_modprobe_param = param
@@ -592,46 +766,60 @@ class AcerSenseManager:
             
     def _wait_for_driver_files(self, timeout: float = 2.0):
         """Wait for the Nitro/Predator driver paths to appear in /sys"""
-        start_time = time.time()
-        predator_path = "/sys/module/linuwu_sense/drivers/platform:acer-wmi/acer-wmi/predator_sense"
-        nitro_path = "/sys/module/linuwu_sense/drivers/platform:acer-wmi/acer-wmi/nitro_sense"
-        
+        start_time = time.monotonic()
+        predator_path = os.path.join(ACER_WMI_PATH, "predator_sense")
+        nitro_path = os.path.join(ACER_WMI_PATH, "nitro_sense")
+
+        # Typical case: driver is already up, return without sleeping at all
+        if os.path.exists(predator_path) or os.path.exists(nitro_path):
+            return True
+
         if not self.disable_logs:
             log.info(f"Waiting for driver files to initialize (max {timeout}s)...")
             
-        while time.time() - start_time < timeout:
+        while time.monotonic() - start_time < timeout:
+            time.sleep(0.01) # Poll every 10ms
             if os.path.exists(predator_path) or os.path.exists(nitro_path):
                 if not self.disable_logs:
-                    log.info(f"Driver files detected after {time.time() - start_time:.3f}s")
+                    log.info(f"Driver files detected after {time.monotonic() - start_time:.3f}s")
                 return True
-            time.sleep(0.05) # Poll every 50ms
             
         if not self.disable_logs:
             log.warning("Timeout reached waiting for driver files. Proceeding with detection.")
         return False
 
-    def _detect_laptop_type(self) -> LaptopType:
-        """Detect whether this is a Predator or Nitro laptop"""
-        predator_path = "/sys/module/linuwu_sense/drivers/platform:acer-wmi/acer-wmi/predator_sense"
-        nitro_path = "/sys/module/linuwu_sense/drivers/platform:acer-wmi/acer-wmi/nitro_sense"
+    def _probe_acer_wmi(self) -> Set[str]:
+        """List the acer-wmi driver directory once (empty set if missing)"""
+        try:
+            return set(os.listdir(ACER_WMI_PATH))
+        except OSError:
+            return set()
 
-        if os.path.exists(predator_path):
+    def _detect_laptop_type(self, entries: Set[str]) -> LaptopType:
+        """Detect whether this is a Predator or Nitro laptop"""
+        if "predator_sense" in entries:
             return LaptopType.PREDATOR
-        elif os.path.exists(nitro_path):
+        elif "nitro_sense" in entries:
             return LaptopType.NITRO
         else:
             return LaptopType.UNKNOWN
 
     def _get_base_path(self) -> str:
         """Get the base path for VFS access based on laptop type"""
-        if self.laptop_type == LaptopType.PREDATOR:
-            return "/sys/module/linuwu_sense/drivers/platform:acer-wmi/acer-wmi/predator_sense"
-        elif self.laptop_type == LaptopType.NITRO:
-            return "/sys/module/linuwu_sense/drivers/platform:acer-wmi/acer-wmi/nitro_sense"
-        else:
-            return ""
+        subdirs = {
+            LaptopType.PREDATOR: "predator_sense",
+            LaptopType.NITRO: "nitro_sense",
+        }
+        subdir = subdirs.get(self.laptop_type)
+        return os.path.join(ACER_WMI_PATH, subdir) if subdir else ""
 
     def get_driver_version(self) -> str:
+        """Get Driver version, probed once (a driver update restarts the daemon)"""
+        if self._driver_version is None:
+            self._driver_version = self._probe_driver_version()
+        return self._driver_version
+
+    def _probe_driver_version(self) -> str:
         """Get Driver version using DKMS (human-readable) or module fallback"""
         # 1. Try DKMS status first (as used in setup.sh)
         try:
@@ -667,16 +855,20 @@ class AcerSenseManager:
         return "Unknown Version"
     
 
-    def _detect_available_features(self) -> Set[str]:
-        """Detect which features are available on the current laptop"""
+    def _detect_available_features(self) -> FrozenSet[str]:
+        """Detect which features are available on the current laptop (fixed for the daemon's lifetime)"""
         available = set()
 
         # Always check thermal profile since it's ACPI standard
-        if os.path.exists("/sys/firmware/acpi/platform_profile"):
+        if os.path.exists(PLATFORM_PROFILE_PATH):
             available.add("thermal_profile")
 
         # Only check other features if laptop type is recognized
-        if self.laptop_type != LaptopType.UNKNOWN and os.path.exists(self.base_path):
+        if self.laptop_type != LaptopType.UNKNOWN and os.path.isdir(self.base_path):
+            # One directory scan instead of a stat() per candidate file
+            with os.scandir(self.base_path) as it:
+                base_entries = {entry.name for entry in it}
+
             feature_files = [
                 ("backlight_timeout", "backlight_timeout"),
                 ("battery_calibration", "battery_calibration"),
@@ -688,25 +880,28 @@ class AcerSenseManager:
             ]
 
             for feature_name, file_name in feature_files:
-                file_path = os.path.join(self.base_path, file_name)
-                if os.path.exists(file_path):
+                if file_name in base_entries:
                     available.add(feature_name)
 
         # Check keyboard features
         if self.has_four_zone_kb:
-            kb_base = "/sys/module/linuwu_sense/drivers/platform:acer-wmi/acer-wmi/four_zoned_kb"
-            if os.path.exists(os.path.join(kb_base, "per_zone_mode")):
+            kb_base = os.path.join(ACER_WMI_PATH, "four_zoned_kb")
+            try:
+                with os.scandir(kb_base) as it:
+                    kb_entries = {entry.name for entry in it}
+            except OSError:
+                kb_entries = set()
+            if "per_zone_mode" in kb_entries:
                 available.add("per_zone_mode")
-            if os.path.exists(os.path.join(kb_base, "four_zone_mode")):
+            if "four_zone_mode" in kb_entries:
                 available.add("four_zone_mode")
 
-        return available
+        return frozenset(available)
 
-    def _check_four_zone_kb(self) -> bool:
+    def _check_four_zone_kb(self, entries: Set[str]) -> bool:
         """Check if four-zone keyboard is available"""
         if self.laptop_type != LaptopType.UNKNOWN:
-            kb_path = "/sys/module/linuwu_sense/drivers/platform:acer-wmi/acer-wmi/four_zoned_kb"
-            return os.path.exists(kb_path)
+            return "four_zoned_kb" in entries
         return False
 
     def _read_file(self, path: str) -> str:
@@ -736,11 +931,69 @@ class AcerSenseManager:
             log.error(f"Failed to write to {path}: {e}")
             return False
 
+    def _feature_path(self, feature: str) -> str:
+        """Return the sysfs attribute backing a feature"""
+        if feature == "thermal_profile":
+            return PLATFORM_PROFILE_PATH
+        if feature in ("per_zone_mode", "four_zone_mode"):
+            return os.path.join(ACER_WMI_PATH, "four_zoned_kb", feature)
+        return os.path.join(self.base_path, feature)
+
+    def _open_feature_fds(self):
+        """Keep long-lived fds on feature attributes for pread/pwrite access"""
+        for feature in self.available_features:
+            path = self._feature_path(feature)
+            try:
+                self._feature_fds[feature] = os.open(path, os.O_RDWR | os.O_CLOEXEC)
+            except OSError as e:
+                log.warning(f"Could not open {path}, falling back to per-call access: {e}")
+
+    def close(self):
+        """Flush pending config changes and release file descriptors held by the manager"""
+        if self._config_flush_timer is not None:
+            self.flush_config()
+        for fd in self._feature_fds.values():
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+        self._feature_fds.clear()
+
+    def _read_feature(self, feature: str) -> str:
+        """Read a feature attribute through its held fd"""
+        fd = self._feature_fds.get(feature)
+        if fd is None:
+            return self._read_file(self._feature_path(feature))
+        try:
+            return os.pread(fd, 4096, 0).decode().strip()
+        except OSError as e:
+            log.error(f"Failed to read from {self._feature_path(feature)}: {e}")
+            return ""
+
+    def _write_feature(self, feature: str, value: str) -> bool:
+        """Write a feature attribute through its held fd, skipping redundant writes"""
+        fd = self._feature_fds.get(feature)
+        if fd is None:
+            self._settings_cache = None
+            return self._write_file(self._feature_path(feature), value)
+        try:
+            try:
+                if os.pread(fd, 4096, 0).decode().strip() == value:
+                    return True
+            except OSError:
+                pass # Write-only attribute
+            os.pwrite(fd, value.encode(), 0)
+            self._settings_cache = None
+            return True
+        except OSError as e:
+            log.error(f"Failed to write to {self._feature_path(feature)}: {e}")
+            return False
+
     def get_thermal_profile(self) -> str:
         """Get current thermal profile"""
         if "thermal_profile" not in self.available_features:
             return ""
-        return self._read_file("/sys/firmware/acpi/platform_profile")
+        return self._read_feature("thermal_profile")
 
     def set_thermal_profile(self, profile: str, force: bool = False) -> bool:
         """Set thermal profile with validation and fallback.
@@ -748,7 +1001,7 @@ class AcerSenseManager:
         if "thermal_profile" not in self.available_features:
             return False
 
-        available_profiles = self.get_thermal_profile_choices()
+        available_profiles = self._profile_choices_set
         
         # Handle mapping/fallback if profile not directly supported
         if profile not in available_profiles:
@@ -764,13 +1017,13 @@ class AcerSenseManager:
             
             # Final check
             if profile not in available_profiles:
-                log.error(f"Cannot map profile '{profile}' to any available choice: {available_profiles}")
+                log.error(f"Cannot map profile '{profile}' to any available choice: {list(self._profile_choices)}")
                 return False
             
             log.info(f"Mapped to valid profile: {profile}")
 
         # Write to hardware (internal _write_file already handles redundancy)
-        success = self._write_file("/sys/firmware/acpi/platform_profile", profile)
+        success = self._write_feature("thermal_profile", profile)
         
         # side-effects: Always apply these if forced or if write succeeded
         # This ensures EPP, WiFi, Hyprland etc are correct even if the profile was already the same
@@ -788,12 +1041,7 @@ class AcerSenseManager:
         """Apply advanced power optimizations (CPU EPP, WiFi, Turbo) based on profile"""
         try:
             # 1. Detect Power Source
-            is_ac = False
-            # Check standard paths
-            for p in ["/sys/class/power_supply/AC/online", "/sys/class/power_supply/ACAD/online", "/sys/class/power_supply/ADP1/online", "/sys/class/power_supply/AC0/online"]:
-                if os.path.exists(p) and self._read_file(p) == "1":
-                    is_ac = True
-                    break
+            is_ac = self._is_ac_online()
             
             # 2. Determine Settings
             epp = "balance_performance"
@@ -854,161 +1102,264 @@ class AcerSenseManager:
 
             # --- Advanced System Optimizations (TLP Replacement) ---
             
+            # Collected into one batch and written by _write_file_safe below
+            tunables: Dict[str, str] = {}
+
             # 6. Audio Power Save (snd_hda_intel)
             audio_power = "1" if not is_ac or profile == "quiet" else "0"
-            self._write_file_safe("/sys/module/snd_hda_intel/parameters/power_save", audio_power)
+            tunables["/sys/module/snd_hda_intel/parameters/power_save"] = audio_power
             
             # 7. NMI Watchdog (Disable on battery to save CPU wakeups)
             nmi_watchdog = "1" if is_ac else "0"
-            self._write_file_safe("/proc/sys/kernel/nmi_watchdog", nmi_watchdog)
+            tunables["/proc/sys/kernel/nmi_watchdog"] = nmi_watchdog
 
             # 8. VM Writeback Timeout (Longer on battery to keep disk asleep)
             # 1500 (15s) on AC, 6000 (60s) on Battery
             vm_writeback = "1500" if is_ac else "6000"
-            self._write_file_safe("/proc/sys/vm/dirty_writeback_centisecs", vm_writeback)
+            tunables["/proc/sys/vm/dirty_writeback_centisecs"] = vm_writeback
 
             # 9. PCIe ASPM (Active State Power Management)
             # 'default' (BIOS) on AC, 'powersave' on Battery
             # Note: Some systems might not allow changing this at runtime
             aspm_policy = "default" if is_ac else "powersave"
-            self._write_file_safe("/sys/module/pcie_aspm/parameters/policy", aspm_policy)
+            tunables["/sys/module/pcie_aspm/parameters/policy"] = aspm_policy
 
             # 10. SATA/AHCI Link Power Management
             # 'max_performance' on AC, 'med_power_with_dipm' on Battery
             sata_policy = "max_performance" if is_ac else "med_power_with_dipm"
             sata_hosts = glob.glob("/sys/class/scsi_host/host*/link_power_management_policy")
             for host in sata_hosts:
-                self._write_file_safe(host, sata_policy)
+                tunables[host] = sata_policy
 
             # 11. USB Autosuspend (usbcore)
             # -1 = Disabled, 2 = Enable (2 seconds delay)
             usb_autosuspend = "-1" if is_ac else "2"
-            self._write_file_safe("/sys/module/usbcore/parameters/autosuspend", usb_autosuspend)
+            tunables["/sys/module/usbcore/parameters/autosuspend"] = usb_autosuspend
+
+            self._write_file_safe(tunables)
 
         except Exception as e:
             log.error(f"Error applying optimizations: {e}")
             log.error(traceback.format_exc())
 
-    def _write_file_safe(self, path, value):
-        """Helper to write to a file only if it exists and the value is different, suppressing errors"""
-        if os.path.exists(path):
+    def _write_file_safe(self, values: Dict[str, str]) -> int:
+        """Write {path: value} pairs, skipping missing files and unchanged values, suppressing errors.
+        Paths sharing a parent directory are opened relative to one directory fd.
+        Returns the number of paths that now hold the requested value."""
+        done = 0
+        by_dir: Dict[str, List[Tuple[str, str]]] = {}
+        for path in sorted(values):
+            parent, name = os.path.split(path)
+            by_dir.setdefault(parent, []).append((name, str(values[path])))
+
+        for parent, entries in by_dir.items():
             try:
-                # Performance optimization: Only write if the value actually changed
-                try:
-                    with open(path, 'r') as f:
-                        if f.read().strip() == str(value):
-                            return True
-                except: pass
-
-                with open(path, 'w') as f:
-                    f.write(str(value))
-                return True
-            except IOError:
-                pass # Permission denied or immutable
-        return False
+                dir_fd = os.open(parent, os.O_RDONLY | os.O_DIRECTORY | os.O_CLOEXEC)
+            except OSError:
+                continue # Subsystem not present on this machine
+            try:
+                for name, value in entries:
+                    try:
+                        fd = os.open(name, os.O_RDWR | os.O_CLOEXEC, dir_fd=dir_fd)
+                    except OSError:
+                        continue # Missing, permission denied or immutable
+                    try:
+                        # Performance optimization: Only write if the value actually changed
+                        try:
+                            if os.pread(fd, 4096, 0).decode().strip() == value:
+                                done += 1
+                                continue
+                        except OSError:
+                            pass
+                        os.pwrite(fd, value.encode(), 0)
+                        done += 1
+                    except OSError:
+                        pass # Value rejected by the kernel
+                    finally:
+                        os.close(fd)
+            finally:
+                os.close(dir_fd)
+        return done
 
     def _get_hyprland_info(self):
+        """Return (user, signature, wayland_display) of the active Hyprland session, cached briefly"""
+        timestamp, cached = self._hypr_info_cache
+        if cached is not None and time.monotonic() - timestamp < self.HYPR_INFO_TTL:
+            return cached
+
+        info = self._scan_hyprland_info()
+        # Only remember hits so a session that starts later is picked up on the next call
+        self._hypr_info_cache = (time.monotonic(), info if info[0] else None)
+        return info
+
+    def _invalidate_hyprland_info(self):
+        """Drop the cached Hyprland session so the next lookup re-scans /run/user"""
+        self._hypr_info_cache = (0.0, None)
+
+    def _scan_hyprland_info(self):
         """Find the active Hyprland instance signature, user, and Wayland display dynamically"""
         base_run_dir = "/run/user"
-        if not os.path.exists(base_run_dir):
+        try:
+            run_it = os.scandir(base_run_dir)
+        except OSError:
             return None, None, None
 
-        for user_dir in os.listdir(base_run_dir):
-            if not user_dir.isdigit():
-                continue
-            
-            uid = int(user_dir)
-            user_run_path = os.path.join(base_run_dir, user_dir)
-            hypr_dir = os.path.join(user_run_path, "hypr")
-            
-            # Find WAYLAND_DISPLAY
+        # DirEntry reuses the d_type from getdents, so no extra stat() per entry
+        with run_it:
+            user_dirs = [e for e in run_it if e.name.isdigit() and e.is_dir(follow_symlinks=False)]
+
+        for user_entry in user_dirs:
+            uid = int(user_entry.name)
+
+            # Find WAYLAND_DISPLAY and the hypr dir in a single pass
             wayland_display = None
+            hypr_entry = None
             try:
-                # Look for wayland-0, wayland-1, etc.
-                for item in os.listdir(user_run_path):
-                    if item.startswith("wayland-") and os.path.exists(os.path.join(user_run_path, item)) and "lock" not in item:
-                         # Simple heuristic: pick the first one that looks like a socket
-                         wayland_display = item
-                         break
+                with os.scandir(user_entry.path) as it:
+                    for item in it:
+                        # Look for wayland-0, wayland-1, etc.
+                        if wayland_display is None and item.name.startswith("wayland-") and "lock" not in item.name:
+                            # Simple heuristic: pick the first one that looks like a socket
+                            wayland_display = item.name
+                        elif item.name == "hypr" and item.is_dir():
+                            hypr_entry = item
             except OSError:
                 pass
 
-            if os.path.isdir(hypr_dir):
-                # Search for signature directories within this user's hypr dir
-                for item in os.listdir(hypr_dir):
-                    signature_path = os.path.join(hypr_dir, item)
-                    if os.path.isdir(signature_path) and "." not in item:
-                        try:
-                            contents = os.listdir(signature_path)
-                            if any(x.endswith(".sock") for x in contents):
-                                # Found it!
-                                try:
-                                    username = pwd.getpwuid(uid).pw_name
-                                    log.info(f"Found active Hyprland instance: User={username}, Sig={item}, Display={wayland_display}")
-                                    return username, item, wayland_display
-                                except KeyError:
-                                    continue
-                        except OSError:
-                            continue
+            if hypr_entry is None:
+                continue
+
+            # Search for signature directories within this user's hypr dir
+            try:
+                with os.scandir(hypr_entry.path) as it:
+                    signatures = [e for e in it if "." not in e.name and e.is_dir()]
+            except OSError:
+                continue
+
+            for sig_entry in signatures:
+                try:
+                    with os.scandir(sig_entry.path) as it:
+                        has_socket = any(x.name.endswith(".sock") for x in it)
+                except OSError:
+                    continue
+
+                if has_socket:
+                    # Found it!
+                    try:
+                        username = pwd.getpwuid(uid).pw_name
+                        log.info(f"Found active Hyprland instance: User={username}, Sig={sig_entry.name}, Display={wayland_display}")
+                        return username, sig_entry.name, wayland_display
+                    except KeyError:
+                        continue
         
         log.warning("No active Hyprland instance found.")
         return None, None, None
 
-    def _write_user_file_atomically(self, path: str, content: list, uid: int, gid: int) -> bool:
+    def _resolve_user(self, username: str) -> Tuple[int, int, str]:
+        """Return (uid, gid, home) for a user, memoized to avoid repeated NSS lookups"""
+        entry = self._pwd_cache.get(username)
+        if entry is None:
+            user_info = pwd.getpwnam(username)
+            entry = (user_info.pw_uid, user_info.pw_gid, user_info.pw_dir)
+            self._pwd_cache[username] = entry
+        return entry
+
+    def _user_file_matches(self, path: str, content: str) -> bool:
+        """Check whether a file already holds exactly the given content"""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return f.read() == content
+        except OSError:
+            return False
+
+    def _write_user_file_atomically(self, path: str, content: Union[str, bytes, List[str]], uid: int, gid: int) -> bool:
         """
         Securely and atomically write a file for a user.
         Handles symlinks by verifying ownership of the target file.
+        Every check and write after resolving the target goes through one directory fd,
+        so swapping path components mid-write cannot redirect it.
         """
+        dir_fd = None
+        tmp_name = None
         try:
             target_path = path
+            via_symlink = os.path.islink(path)
 
-            # 1. Security Check: Symlink Handling
-            if os.path.islink(path):
-                # Resolve the symlink to the real path
-                real_path = os.path.realpath(path)
-                
-                # Get stats of the real path
+            # 1. Resolve the symlink to the real path; ownership is verified below on the pinned fd
+            if via_symlink:
+                target_path = os.path.realpath(path)
+
+            parent, name = os.path.split(target_path)
+            dir_fd = os.open(parent or ".", os.O_RDONLY | os.O_DIRECTORY | os.O_CLOEXEC)
+
+            # 2. Security Check on the actual target (O_PATH: no read access needed, never follows)
+            try:
+                target_fd = os.open(name, os.O_PATH | os.O_NOFOLLOW | os.O_CLOEXEC, dir_fd=dir_fd)
                 try:
-                    file_stat = os.stat(real_path)
-                except OSError:
+                    file_stat = os.fstat(target_fd)
+                finally:
+                    os.close(target_fd)
+            except FileNotFoundError:
+                file_stat = None # New file
+                if via_symlink:
                     log.error(f"Cannot stat target of symlink {path}. Aborting.")
                     return False
 
+            if via_symlink:
                 # SECURITY: Check if the target file is owned by the user we are writing for.
                 # This prevents attacks where a user symlinks to a root-owned file (like /etc/shadow).
                 if file_stat.st_uid != uid:
-                    log.error(f"SECURITY ALERT: Symlink {path} points to {real_path} which is NOT owned by user {uid}. Aborting.")
+                    log.error(f"SECURITY ALERT: Symlink {path} points to {target_path} which is NOT owned by user {uid}. Aborting.")
                     return False
-                
-                log.debug(f"Followed safe symlink: {path} -> {real_path}")
-                target_path = real_path
+                log.debug(f"Followed safe symlink: {path} -> {target_path}")
 
-            # 2. Prepare Temp File (create it alongside the target to ensure same filesystem)
-            tmp_path = target_path + ".tmp"
-            
-            # 3. Write to Temp File
-            with open(tmp_path, 'w') as f:
-                if isinstance(content, list):
-                    f.writelines(content)
-                else:
-                    f.write(content)
-            
-            # 4. Set Permissions on Temp File
-            os.chown(tmp_path, uid, gid)
-            os.chmod(tmp_path, 0o644) 
+            # 3. Prepare Temp File next to the target (same filesystem)
+            # Unpredictable name so a user cannot pre-plant a file or symlink at it
+            tmp_name = f".{name}.tmp.{os.getpid()}.{secrets.token_hex(4)}"
 
-            # 5. Atomic Move
-            os.replace(tmp_path, target_path)
+            # 4. Write to Temp File (O_EXCL|O_NOFOLLOW: never reuse or follow an existing path)
+            fd = os.open(tmp_name, os.O_WRONLY | os.O_CREAT | os.O_EXCL | os.O_NOFOLLOW | os.O_CLOEXEC,
+                         0o644, dir_fd=dir_fd)
+            if isinstance(content, bytes):
+                # Pre-encoded templates go straight to the fd, no text layer
+                try:
+                    view = memoryview(content)
+                    while view:
+                        view = view[os.write(fd, view):]
+                    os.fchown(fd, uid, gid)
+                    os.fchmod(fd, 0o644)
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+            else:
+                with os.fdopen(fd, 'w') as f:
+                    if isinstance(content, list):
+                        f.writelines(content)
+                    else:
+                        f.write(content)
+                    f.flush()
+                    # 5. Set Permissions on Temp File
+                    os.fchown(f.fileno(), uid, gid)
+                    os.fchmod(f.fileno(), 0o644)
+                    os.fsync(f.fileno())
+
+            # 6. Atomic Move within the pinned directory, then persist the rename itself
+            os.replace(tmp_name, name, src_dir_fd=dir_fd, dst_dir_fd=dir_fd)
+            tmp_name = None
+            os.fsync(dir_fd)
             return True
 
         except Exception as e:
             log.error(f"Failed to write file atomically to {path}: {e}")
-            if 'tmp_path' in locals() and os.path.exists(tmp_path):
+            if tmp_name is not None and dir_fd is not None:
                 try:
-                    os.unlink(tmp_path)
-                except:
+                    os.unlink(tmp_name, dir_fd=dir_fd)
+                except OSError:
                     pass
             return False
+        finally:
+            if dir_fd is not None:
+                os.close(dir_fd)
 
     def _get_user_config_dir(self, user_home: str) -> str:
         """Get the config directory respecting XDG_CONFIG_HOME"""
@@ -1017,18 +1368,31 @@ class AcerSenseManager:
         # Standard fallback is reliable enough for this context.
         return os.path.join(user_home, ".config")
 
-    def _resolve_hyprland_entrypoint(self, user_home: str) -> Tuple[str, str]:
-        """Return active Hyprland config path and parser mode ('lua' or 'hyprlang')."""
-        config_dir = os.path.join(self._get_user_config_dir(user_home), "hypr")
-        lua_path = os.path.join(config_dir, "hyprland.lua")
-        conf_path = os.path.join(config_dir, "hyprland.conf")
+    def _hypr_paths(self, user_home: str) -> HyprPaths:
+        """Build (once per home dir) the Hyprland paths used by the helpers below"""
+        paths = self._hypr_paths_cache.get(user_home)
+        if paths is None:
+            config_dir = os.path.join(self._get_user_config_dir(user_home), "hypr")
+            paths = HyprPaths(
+                dir=config_dir,
+                acersense=os.path.join(config_dir, "acersense.conf"),
+                acersense_lua=os.path.join(config_dir, "custom", "acersense.lua"),
+                bat=os.path.join(config_dir, "acersense_bat.conf"),
+                charge=os.path.join(config_dir, "acersense_charge.conf"),
+                hyprland_conf=os.path.join(config_dir, "hyprland.conf"),
+                hyprland_lua=os.path.join(config_dir, "hyprland.lua"),
+            )
+            self._hypr_paths_cache[user_home] = paths
+        return paths
 
+    def _resolve_hyprland_entrypoint(self, paths: HyprPaths) -> Tuple[str, str]:
+        """Return active Hyprland config path and parser mode ('lua' or 'hyprlang')."""
         # Hyprland prioritizes hyprland.lua when present.
-        if os.path.exists(lua_path):
-            return lua_path, "lua"
-        if os.path.exists(conf_path):
-            return conf_path, "hyprlang"
-        return lua_path, "lua"
+        if os.path.exists(paths.hyprland_lua):
+            return paths.hyprland_lua, "lua"
+        if os.path.exists(paths.hyprland_conf):
+            return paths.hyprland_conf, "hyprlang"
+        return paths.hyprland_lua, "lua"
 
     def _get_hyprland_valid_keys(self) -> Set[str]:
         """Load valid config key paths from Hyprland lua stubs (best-effort)."""
@@ -1307,81 +1671,84 @@ class AcerSenseManager:
         return "\n".join(lines)
 
     def _ensure_hyprland_config_source_impl(self):
-        """Ensure AcerSense visuals are sourced from active Hyprland entrypoint."""
+        """Ensure AcerSense visuals are sourced from active Hyprland entrypoint.
+        Returns True if the entrypoint had to be modified."""
         target_user, _, _ = self._get_hyprland_info()
         if not target_user:
-            return
+            return False
 
         try:
-            user_info = pwd.getpwnam(target_user)
-            user_home = user_info.pw_dir
-            uid = user_info.pw_uid
-            gid = user_info.pw_gid
+            uid, gid, user_home = self._resolve_user(target_user)
 
-            hypr_config_path, mode = self._resolve_hyprland_entrypoint(user_home)
+            hypr_config_path, mode = self._resolve_hyprland_entrypoint(self._hypr_paths(user_home))
             if not os.path.exists(hypr_config_path):
                 log.warning(f"Main Hyprland config not found at {hypr_config_path}")
-                return
+                return False
 
-            with open(hypr_config_path, "r", encoding="utf-8") as f:
-                content = f.read()
+            require_line = 'require("custom.acersense")'
+            if mode == "lua":
+                needle = require_line
+                block = (
+                    "\n-- Added by AcerSense for Opacity/Blur control (Lua)\n"
+                    'if is_file_exists(HOME .. "/.config/hypr/custom/acersense.lua") then\n'
+                    f"    {require_line}\n"
+                    "end\n"
+                )
+            else:
+                needle = "acersense.conf"
+                block = (
+                    "\n# Added by AcerSense for Opacity/Blur control\n"
+                    "source = ~/.config/hypr/acersense.conf\n"
+                )
 
+            # One streaming pass on one fd: stop at the marker, or append at EOF
+            with open(hypr_config_path, "r+", encoding="utf-8") as f:
+                last_line = ""
+                for last_line in f:
+                    if needle in last_line:
+                        return False
+                if last_line and not last_line.endswith("\n"):
+                    f.write("\n")
+                f.write(block)
+
+            os.chown(hypr_config_path, uid, gid)
             if mode == "lua":
-                marker = "-- Added by AcerSense for Opacity/Blur control (Lua)"
-                require_line = 'require("custom.acersense")'
-                if require_line not in content:
-                    block = (
-                        f"\n{marker}\n"
-                        'if is_file_exists(HOME .. "/.config/hypr/custom/acersense.lua") then\n'
-                        f"    {require_line}\n"
-                        "end\n"
-                    )
-                    with open(hypr_config_path, "a", encoding="utf-8") as f:
-                        if content and not content.endswith("\n"):
-                            f.write("\n")
-                        f.write(block)
-                    os.chown(hypr_config_path, uid, gid)
-                    log.info("Injected AcerSense require block into hyprland.lua")
+                log.info("Injected AcerSense require block into hyprland.lua")
             else:
-                source_line = "source = ~/.config/hypr/acersense.conf\n"
-                if "acersense.conf" not in content:
-                    with open(hypr_config_path, "a", encoding="utf-8") as f:
-                        if content and not content.endswith("\n"):
-                            f.write("\n")
-                        f.write("\n# Added by AcerSense for Opacity/Blur control\n")
-                        f.write(source_line)
-                    os.chown(hypr_config_path, uid, gid)
-                    log.info("Injected source line into hyprland.conf")
+                log.info("Injected source line into hyprland.conf")
+            return True
 
         except Exception as e:
             log.error(f"Failed to ensure Hyprland config source: {e}")
+        return False
 
     def _remove_hyprland_config_source_impl(self):
         """Remove AcerSense include hooks from both lua and hyprlang entrypoints."""
-        target_user, _, _ = self._get_hyprland_info()
+        target_user, signature, _ = self._get_hyprland_info()
         if not target_user:
             log.warning("Cannot remove Hyprland config source: No active user found.")
             return
 
         try:
-            user_info = pwd.getpwnam(target_user)
-            user_home = user_info.pw_dir
-            uid = user_info.pw_uid
-            gid = user_info.pw_gid
-            config_dir = os.path.join(self._get_user_config_dir(user_home), "hypr")
+            uid, gid, user_home = self._resolve_user(target_user)
+            paths = self._hypr_paths(user_home)
 
             # Clean hyprland.conf (legacy include)
-            conf_path = os.path.join(config_dir, "hyprland.conf")
+            conf_path = paths.hyprland_conf
             if os.path.exists(conf_path):
-                subprocess.run(["sed", "-i", "/source.*acersense.conf/d", conf_path], check=False)
-                subprocess.run(["sed", "-i", "/Added by AcerSense/d", conf_path], check=False)
-                try:
-                    os.chown(conf_path, uid, gid)
-                except OSError:
-                    pass
+                with open(conf_path, "r", encoding="utf-8") as f:
+                    lines = f.readlines()
+
+                # Same filters the old `sed -i` calls applied, done in one pass
+                kept = [
+                    line for line in lines
+                    if not _HYPR_SOURCE_LINE_RE.search(line) and "Added by AcerSense" not in line
+                ]
+                if kept != lines:
+                    self._write_user_file_atomically(conf_path, kept, uid, gid)
 
             # Clean hyprland.lua (lua require block)
-            lua_path = os.path.join(config_dir, "hyprland.lua")
+            lua_path = paths.hyprland_lua
             if os.path.exists(lua_path):
                 with open(lua_path, "r", encoding="utf-8") as f:
                     lua_content = f.read()
@@ -1407,64 +1774,39 @@ class AcerSenseManager:
                         pass
 
             # Reload Hyprland if running
-            signature = self._get_hyprland_info()[1]
             if signature:
-                subprocess.run([
-                    "sudo", "-u", target_user, "env",
-                    f"XDG_RUNTIME_DIR=/run/user/{uid}",
-                    f"HYPRLAND_INSTANCE_SIGNATURE={signature}",
-                    "hyprctl", "reload"
-                ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
-                log.info("AcerSense include hooks removed and Hyprland reloaded.")
+                self._schedule_hyprland_reload(target_user, uid, signature)
+                log.info("AcerSense include hooks removed and Hyprland reload scheduled.")
 
         except Exception as e:
             log.error(f"Failed to remove Hyprland config source: {e}")
 
-    def _ensure_aux_config_files(self, user_home, uid, gid):
+    def _ensure_aux_config_files(self, paths: HyprPaths, uid, gid):
         """Create auxiliary config files (bat/charge) if they don't exist"""
-        config_dir = os.path.join(self._get_user_config_dir(user_home), "hypr")
-        
+        # Already verified for this user; skip the stat() calls on every visual update
+        if uid in self._aux_ready:
+            return
+
+        ready = True
+
         # 1. Battery Config
-        bat_path = os.path.join(config_dir, "acersense_bat.conf")
+        bat_path = paths.bat
         if not os.path.exists(bat_path):
-            content = (
-                "# AcerSense - Battery Mode Settings\n"
-                "# This file is automatically sourced when the device is on BATTERY power.\n"
-                "# You can edit this file to customize visuals (Blur, Shadows, Animations) for power saving.\n"
-                "\n"
-                "decoration {\n"
-                "    blur {\n"
-                "        enabled = false\n"
-                "    }\n"
-                "    # drop_shadow = false\n"
-                "}\n"
-                "\n"
-                "# Note: Window Opacity is managed dynamically by the AcerSense App slider.\n"
-            )
-            if self._write_user_file_atomically(bat_path, content, uid, gid):
+            if self._write_user_file_atomically(bat_path, _BAT_TEMPLATE, uid, gid):
                 log.info("Created default acersense_bat.conf")
+            else:
+                ready = False
 
         # 2. Charge/Performance Config
-        charge_path = os.path.join(config_dir, "acersense_charge.conf")
+        charge_path = paths.charge
         if not os.path.exists(charge_path):
-            content = (
-                "# AcerSense - Charging/Performance Mode Settings\n"
-                "# This file is automatically sourced when the device is PLUGGED IN.\n"
-                "# You can edit this file to customize visuals (Blur, Shadows, Animations) for high performance.\n"
-                "\n"
-                "decoration {\n"
-                "    blur {\n"
-                "        enabled = true\n"
-                "        size = 8\n"
-                "        passes = 2\n"
-                "    }\n"
-                "    # drop_shadow = true\n"
-                "}\n"
-                "\n"
-                "# Note: Window Opacity is managed dynamically by the AcerSense App slider.\n"
-            )
-            if self._write_user_file_atomically(charge_path, content, uid, gid):
+            if self._write_user_file_atomically(charge_path, _CHARGE_TEMPLATE, uid, gid):
                 log.info("Created default acersense_charge.conf")
+            else:
+                ready = False
+
+        if ready:
+            self._aux_ready.add(uid)
 
     def _update_hyprland_visuals(self, profile: str):
         """Update AcerSense visuals for active Hyprland parser mode (lua/hyprlang)."""
@@ -1475,75 +1817,107 @@ class AcerSenseManager:
 
         try:
             # Get User Home and UID/GID
-            user_info = pwd.getpwnam(target_user)
-            user_home = user_info.pw_dir
-            uid = user_info.pw_uid
-            gid = user_info.pw_gid
+            uid, gid, user_home = self._resolve_user(target_user)
+            paths = self._hypr_paths(user_home)
             
             # Ensure aux files exist first (safe to call repeatedly)
-            self._ensure_aux_config_files(user_home, uid, gid)
+            self._ensure_aux_config_files(paths, uid, gid)
 
             # Self-heal include hook: if user's hyprland.lua was overwritten
             # (e.g. dotfiles update), ensure AcerSense include exists again.
+            changed = False
             if getattr(self, "hyprland_integration", False):
-                self._ensure_hyprland_config_source_impl()
+                changed = self._ensure_hyprland_config_source_impl()
             
             # Target manager files
-            config_dir = os.path.join(self._get_user_config_dir(user_home), "hypr")
-            legacy_manager_path = os.path.join(config_dir, "acersense.conf")
-            lua_manager_path = os.path.join(config_dir, "custom", "acersense.lua")
+            legacy_manager_path = paths.acersense
+            lua_manager_path = paths.acersense_lua
 
-            if not os.path.exists(config_dir):
+            if not os.path.exists(paths.dir):
                 return
 
             # Determine mode and opacity based on profile
-            is_high_perf = profile in ["balanced", "balanced-performance", "performance", "turbo"]
+            is_high_perf = profile in self._HIGH_PERF_PROFILES
             if is_high_perf:
                 active = self.ac_active_opacity
                 inactive = self.ac_inactive_opacity
-                source_file = "acersense_charge.conf"
+                source_path = paths.charge
             else:
                 active = self.bat_active_opacity
                 inactive = self.bat_inactive_opacity
-                source_file = "acersense_bat.conf"
+                source_path = paths.bat
 
-            source_path = os.path.join(config_dir, source_file)
+            source_file = os.path.basename(source_path)
             log.info(f"Updating Hyprland Config -> Sourcing: {source_file}, Opacity: {active}/{inactive}")
 
             # Always keep legacy manager file up-to-date for non-lua fallback.
-            legacy_content: List[str] = []
-            legacy_content.append("# AUTO-GENERATED by AcerSense. DO NOT EDIT THIS FILE MANUALLY.\n")
-            legacy_content.append("# This file switches between _bat.conf and _charge.conf based on power state.\n")
-            legacy_content.append("# To customize visuals, edit 'acersense_bat.conf' or 'acersense_charge.conf'.\n\n")
-            legacy_content.append(f"source = ~/.config/hypr/{source_file}\n\n")
-            legacy_content.append("# Dynamic Opacity Rules (Managed by App)\n")
-            legacy_content.append(f"windowrule = match:class .*, opacity {active} override {inactive} override\n")
-            self._write_user_file_atomically(legacy_manager_path, legacy_content, uid, gid)
+            legacy_content = (
+                "# AUTO-GENERATED by AcerSense. DO NOT EDIT THIS FILE MANUALLY.\n"
+                "# This file switches between _bat.conf and _charge.conf based on power state.\n"
+                "# To customize visuals, edit 'acersense_bat.conf' or 'acersense_charge.conf'.\n\n"
+                f"source = ~/.config/hypr/{source_file}\n\n"
+                "# Dynamic Opacity Rules (Managed by App)\n"
+                f"windowrule = match:class .*, opacity {active} override {inactive} override\n"
+            )
+            if not self._user_file_matches(legacy_manager_path, legacy_content):
+                self._write_user_file_atomically(legacy_manager_path, legacy_content, uid, gid)
+                changed = True
 
             # If active entrypoint is lua, generate custom/acersense.lua from the selected mode file.
-            _, parser_mode = self._resolve_hyprland_entrypoint(user_home)
+            _, parser_mode = self._resolve_hyprland_entrypoint(paths)
             if parser_mode == "lua":
                 os.makedirs(os.path.dirname(lua_manager_path), exist_ok=True)
                 lua_content = self._build_acersense_lua_content(source_path, active, inactive)
-                self._write_user_file_atomically(lua_manager_path, lua_content, uid, gid)
+                if not self._user_file_matches(lua_manager_path, lua_content):
+                    self._write_user_file_atomically(lua_manager_path, lua_content, uid, gid)
+                    changed = True
+
+            if not changed:
+                log.debug("Hyprland manager files already up to date, skipping reload")
+                return
 
             # Reload Hyprland after writing manager files.
             if signature:
-                # Reload Hyprland
-                cmd = [
-                    "sudo", "-u", target_user,
-                    "env",
-                    f"XDG_RUNTIME_DIR=/run/user/{uid}",
-                    f"HYPRLAND_INSTANCE_SIGNATURE={signature}",
-                    "hyprctl", "reload"
-                ]
-
-                subprocess.run(cmd, check=False, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-                log.debug("Triggered Hyprland reload")
+                self._schedule_hyprland_reload(target_user, uid, signature)
 
         except Exception as e:
             log.error(f"Failed to update Hyprland visuals: {e}")
 
+    def _schedule_hyprland_reload(self, target_user: str, uid: int, signature: str):
+        """Debounce hyprctl reload so bursts of visual updates fork it only once"""
+        with self._reload_lock:
+            if self._pending_reload:
+                self._pending_reload.cancel()
+            self._pending_reload = threading.Timer(
+                self.HYPR_RELOAD_DEBOUNCE, self._reload_hyprland, args=(target_user, uid, signature)
+            )
+            self._pending_reload.daemon = True
+            self._pending_reload.start()
+
+    def _reload_hyprland(self, target_user: str, uid: int, signature: str):
+        """Run hyprctl reload in the user's Hyprland session"""
+        with self._reload_lock:
+            self._pending_reload = None
+        try:
+            _, gid, user_home = self._resolve_user(target_user)
+            env = {
+                "PATH": "/usr/local/bin:/usr/bin:/bin",
+                "HOME": user_home,
+                "USER": target_user,
+                "XDG_RUNTIME_DIR": f"/run/user/{uid}",
+                "HYPRLAND_INSTANCE_SIGNATURE": signature,
+            }
+
+            # Drop to the session user in the child directly (setgroups/setresgid/setresuid)
+            # instead of going through sudo + env
+            subprocess.run(
+                ["hyprctl", "reload"], env=env, user=uid, group=gid, extra_groups=[],
+                check=False, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+            )
+            log.debug("Triggered Hyprland reload")
+        except Exception as e:
+            log.error(f"Failed to reload Hyprland: {e}")
+
     def _ensure_hyprland_config_source(self):
         """Ensure AcerSense include exists in active Hyprland entrypoint."""
         self._ensure_hyprland_config_source_impl()
@@ -1554,29 +1928,48 @@ class AcerSenseManager:
 
     def set_hyprland_integration(self, enabled: bool) -> bool:
         """Set Hyprland integration status"""
+        # 1. Strict Boolean Conversion
+        if isinstance(enabled, str):
+            is_enabled = enabled.lower() in ('true', '1', 'yes', 'on')
+        else:
+            is_enabled = bool(enabled)
+
+        log.info(f"set_hyprland_integration requested. Input: {enabled} -> Resolved: {is_enabled}")
+        self.hyprland_integration = is_enabled
+        self._pwd_cache.clear()
+        self._hypr_paths_cache.clear()
+        self._aux_ready.clear()
+
         try:
-            log.info(f"Hyprland integration set to: {enabled}")
+            # 2. Update Config (in memory; written out by the debounced flush)
+            self._update_config({'HyprlandIntegration': str(is_enabled)})
             
-            if enabled:
-                log.info("Enabling Hyprland integration logic...")
-                self._ensure_hyprland_config_source()
-                self._update_hyprland_visuals(self.last_known_profile)
+            # 3. Execute Logic
+            if is_enabled:
+                log.info("Status: ENABLED. Activating Hyprland integration...")
+                try:
+                    self._ensure_hyprland_config_source()
+                    self._update_hyprland_visuals(self.last_known_profile)
+                except Exception as e:
+                    log.error(f"Error during activation: {e}")
             else:
-                log.info("Disabling Hyprland integration logic (Calling Remove)...")
-                self._remove_hyprland_config_source()
+                log.info("Status: DISABLED. Deactivating Hyprland integration...")
+                try:
+                    self._remove_hyprland_config_source()
+                except Exception as e:
+                    log.error(f"Error during deactivation: {e}")
+                finally:
+                    self._invalidate_hyprland_info()
             
             return True
+
         except Exception as e:
-            log.error(f"Failed to set Hyprland integration: {e}")
+            log.error(f"Critical error in set_hyprland_integration: {e}")
             return False
 
     def get_thermal_profile_choices(self) -> List[str]:
         """Get available thermal profiles"""
-        if "thermal_profile" not in self.available_features:
-            return []
-
-        choices = self._read_file("/sys/firmware/acpi/platform_profile_choices")
-        return choices.split() if choices else []
+        return list(self._profile_choices)
 
     def handle_power_change(self, is_plugged_in: bool):
         """Handles power source changes by setting the appropriate default thermal profile."""
@@ -1586,37 +1979,36 @@ class AcerSenseManager:
         # Broadcast event to GUI
         self._notify_event("power_state_changed", {"plugged_in": is_plugged_in})
         
-        profile_list = self.get_thermal_profile_choices()
-        
         if is_plugged_in:
             target_profile = self.default_ac_profile
         else:
             target_profile = self.default_bat_profile
 
-        # Immediately update visuals to prevent lag/flicker
-        self._update_hyprland_visuals(target_profile)
-
-        if target_profile in profile_list:
+        if target_profile in self._profile_choices_set:
             log.info(f"Setting default profile to: {target_profile}")
             self.last_known_profile = target_profile # Set intent immediately
+            # set_thermal_profile refreshes visuals itself; a second pass here
+            # would only rewrite the same files and fork another hyprctl reload
             self.set_thermal_profile(target_profile)
         else:
             log.warning(f"Default profile '{target_profile}' not available. Skipping auto-switch.")
+            # Still reflect the new power state in the desktop visuals
+            self._update_hyprland_visuals(target_profile)
 
     def get_backlight_timeout(self) -> str:
         """Get backlight timeout status"""
         if "backlight_timeout" not in self.available_features:
             return ""
 
-        return self._read_file(os.path.join(self.base_path, "backlight_timeout"))
+        return self._read_feature("backlight_timeout")
 
     def set_backlight_timeout(self, enabled: bool) -> bool:
         """Set backlight timeout status"""
         if "backlight_timeout" not in self.available_features:
             return False
 
-        return self._write_file(
-            os.path.join(self.base_path, "backlight_timeout"),
+        return self._write_feature(
+            "backlight_timeout",
             "1" if enabled else "0"
         )
 
@@ -1625,15 +2017,15 @@ class AcerSenseManager:
         if "battery_calibration" not in self.available_features:
             return ""
 
-        return self._read_file(os.path.join(self.base_path, "battery_calibration"))
+        return self._read_feature("battery_calibration")
 
     def set_battery_calibration(self, enabled: bool) -> bool:
         """Start or stop battery calibration"""
         if "battery_calibration" not in self.available_features:
             return False
 
-        return self._write_file(
-            os.path.join(self.base_path, "battery_calibration"),
+        return self._write_feature(
+            "battery_calibration",
             "1" if enabled else "0"
         )
 
@@ -1642,15 +2034,15 @@ class AcerSenseManager:
         if "battery_limiter" not in self.available_features:
             return ""
 
-        return self._read_file(os.path.join(self.base_path, "battery_limiter"))
+        return self._read_feature("battery_limiter")
 
     def set_battery_limiter(self, enabled: bool) -> bool:
         """Set battery limiter status"""
         if "battery_limiter" not in self.available_features:
             return False
 
-        return self._write_file(
-            os.path.join(self.base_path, "battery_limiter"),
+        return self._write_feature(
+            "battery_limiter",
             "1" if enabled else "0"
         )
 
@@ -1659,15 +2051,15 @@ class AcerSenseManager:
         if "boot_animation_sound" not in self.available_features:
             return ""
 
-        return self._read_file(os.path.join(self.base_path, "boot_animation_sound"))
+        return self._read_feature("boot_animation_sound")
 
     def set_boot_animation_sound(self, enabled: bool) -> bool:
         """Set boot animation sound status"""
         if "boot_animation_sound" not in self.available_features:
             return False
 
-        return self._write_file(
-            os.path.join(self.base_path, "boot_animation_sound"),
+        return self._write_feature(
+            "boot_animation_sound",
             "1" if enabled else "0"
         )
 
@@ -1676,35 +2068,55 @@ class AcerSenseManager:
         if "fan_speed" not in self.available_features:
             return ("0", "0")
         
-        file_path = os.path.join(self.base_path, "fan_speed")
         try:
-            with open(file_path, 'r') as f:
-                speeds = f.read().strip()
-                if "," in speeds:
-                    c, g = speeds.split(",", 1)
-                    # If values are unusually high (like RPMs), someone else wrote them or it's a bug.
-                    # On most models, the control file only holds 0-100 or specific mode codes.
-                    return (c.strip(), g.strip())
+            speeds = self._read_feature("fan_speed")
+            if "," in speeds:
+                c, g = speeds.split(",", 1)
+                # If values are unusually high (like RPMs), someone else wrote them or it's a bug.
+                # On most models, the control file only holds 0-100 or specific mode codes.
+                return (c.strip(), g.strip())
         except: pass
         return ("0", "0")
 
+    def _bulk_read(self, paths) -> Dict[str, str]:
+        """Read several small sysfs attributes with raw fd calls; missing ones are left out"""
+        values = {}
+        for path in paths:
+            try:
+                fd = os.open(path, os.O_RDONLY | os.O_CLOEXEC)
+            except OSError:
+                continue
+            try:
+                values[path] = os.read(fd, 128).decode().strip()
+            except OSError:
+                pass
+            finally:
+                os.close(fd)
+        return values
+
+    def _find_fan_rpm_paths(self) -> Tuple[str, ...]:
+        """Locate the hwmon fan1/fan2 input attributes (one scandir pass)"""
+        try:
+            with os.scandir("/sys/devices/platform/acer-wmi/hwmon") as it:
+                for entry in it:
+                    return (os.path.join(entry.path, "fan1_input"), os.path.join(entry.path, "fan2_input"))
+        except OSError:
+            pass
+        return ()
+
     def get_fan_rpms(self) -> Tuple[str, str]:
         """Get the actual SENSOR RPM values from hwmon"""
-        cpu_rpm, gpu_rpm = "0", "0"
-        try:
-            hwmon_path = "/sys/devices/platform/acer-wmi/hwmon"
-            if os.path.exists(hwmon_path):
-                hwmons = os.listdir(hwmon_path)
-                if hwmons:
-                    h_dir = os.path.join(hwmon_path, hwmons[0])
-                    f1 = os.path.join(h_dir, "fan1_input")
-                    f2 = os.path.join(h_dir, "fan2_input")
-                    if os.path.isfile(f1):
-                        with open(f1, "r") as f: cpu_rpm = f.read().strip()
-                    if os.path.isfile(f2):
-                        with open(f2, "r") as f: gpu_rpm = f.read().strip()
-        except: pass
-        return (cpu_rpm, gpu_rpm)
+        paths = self._fan_rpm_paths
+        if paths is None:
+            paths = self._find_fan_rpm_paths()
+            if not paths:
+                return ("0", "0")
+            self._fan_rpm_paths = paths
+        values = self._bulk_read(paths)
+        if not values:
+            # hwmon node went away (driver reload); locate it again next time
+            self._fan_rpm_paths = None
+        return (values.get(paths[0], "0"), values.get(paths[1], "0"))
 
     def set_fan_speed(self, cpu: int, gpu: int) -> bool:
         """Set CPU and GPU fan speeds"""
@@ -1721,7 +2133,7 @@ class AcerSenseManager:
             write_val = f"{cpu},{gpu}"
 
         log.info(f"Setting fan speeds -> {write_val}")
-        return self._write_file(os.path.join(self.base_path, "fan_speed"), write_val)
+        return self._write_feature("fan_speed", write_val)
 
 
     def get_lcd_override(self) -> str:
@@ -1729,15 +2141,15 @@ class AcerSenseManager:
         if "lcd_override" not in self.available_features:
             return ""
 
-        return self._read_file(os.path.join(self.base_path, "lcd_override"))
+        return self._read_feature("lcd_override")
 
     def set_lcd_override(self, enabled: bool) -> bool:
         """Set LCD override status"""
         if "lcd_override" not in self.available_features:
             return False
 
-        return self._write_file(
-            os.path.join(self.base_path, "lcd_override"),
+        return self._write_feature(
+            "lcd_override",
             "1" if enabled else "0"
         )
 
@@ -1746,7 +2158,7 @@ class AcerSenseManager:
         if "usb_charging" not in self.available_features:
             return ""
 
-        return self._read_file(os.path.join(self.base_path, "usb_charging"))
+        return self._read_feature("usb_charging")
 
     def set_usb_charging(self, level: int) -> bool:
         """Set USB charging level (0, 10, 20, 30)"""
@@ -1754,12 +2166,12 @@ class AcerSenseManager:
             return False
 
         # Validate values
-        if level not in [0, 10, 20, 30]:
+        if level not in self._USB_CHARGING_LEVELS:
             log.error(f"Invalid USB charging level. Must be 0, 10, 20, or 30: {level}")
             return False
 
-        return self._write_file(
-            os.path.join(self.base_path, "usb_charging"),
+        return self._write_feature(
+            "usb_charging",
             str(level)
         )
 
@@ -1768,7 +2180,7 @@ class AcerSenseManager:
         if "per_zone_mode" not in self.available_features:
             return ""
 
-        return self._read_file("/sys/module/linuwu_sense/drivers/platform:acer-wmi/acer-wmi/four_zoned_kb/per_zone_mode")
+        return self._read_feature("per_zone_mode")
 
     def set_per_zone_mode(self, zone1: str, zone2: str, zone3: str, zone4: str, brightness: int) -> bool:
         """Set per-zone mode configuration
@@ -1781,16 +2193,10 @@ class AcerSenseManager:
             return False
 
         # Validate hex values
-        for i, zone in enumerate([zone1, zone2, zone3, zone4], 1):
-            try:
-                # Check if valid hex color
-                int(zone, 16)
-                if len(zone) != 6:
-                    log.error(f"Invalid hex color for zone {i}: {zone}. Must be 6 characters.")
-                    return False
-            except ValueError:
-                log.error(f"Invalid hex color for zone {i}: {zone}")
-                return False
+        zones = (zone1, zone2, zone3, zone4)
+        if not all(isinstance(z, str) and _HEX6(z) for z in zones):
+            log.error(f"Invalid hex colors for zones: {zones}. Each must be 6 hex characters.")
+            return False
 
         # Validate brightness
         if not (0 <= brightness <= 100):
@@ -1798,8 +2204,8 @@ class AcerSenseManager:
             return False
 
         value = f"{zone1},{zone2},{zone3},{zone4},{brightness}"
-        return self._write_file(
-            "/sys/module/linuwu_sense/drivers/platform:acer-wmi/acer-wmi/four_zoned_kb/per_zone_mode",
+        return self._write_feature(
+            "per_zone_mode",
             value
         )
 
@@ -1808,7 +2214,7 @@ class AcerSenseManager:
         if "four_zone_mode" not in self.available_features:
             return ""
 
-        return self._read_file("/sys/module/linuwu_sense/drivers/platform:acer-wmi/acer-wmi/four_zoned_kb/four_zone_mode")
+        return self._read_feature("four_zone_mode")
 
     def set_four_zone_mode(self, mode: int, speed: int, brightness: int,
                            direction: int, red: int, green: int, blue: int) -> bool:
@@ -1837,17 +2243,17 @@ class AcerSenseManager:
             log.error(f"Invalid brightness. Must be between 0 and 100: {brightness}")
             return False
 
-        if direction not in [1, 2]:
+        if direction not in self._FOUR_ZONE_DIRECTIONS:
             log.error(f"Invalid direction. Must be 1 or 2: {direction}")
             return False
 
-        if not all(0 <= color <= 255 for color in [red, green, blue]):
+        if (red | green | blue) < 0 or max(red, green, blue) > 255:
             log.error(f"Invalid RGB values. Must be between 0 and 255: {red},{green},{blue}")
             return False
 
         value = f"{mode},{speed},{brightness},{direction},{red},{green},{blue}"
-        return self._write_file(
-            "/sys/module/linuwu_sense/drivers/platform:acer-wmi/acer-wmi/four_zoned_kb/four_zone_mode",
+        return self._write_feature(
+            "four_zone_mode",
             value
         )
 
@@ -1855,57 +2261,19 @@ class AcerSenseManager:
         """Get Hyprland integration status"""
         return getattr(self, 'hyprland_integration', False)
 
-    def _ensure_hyprland_config_source(self):
-        """Ensure AcerSense include exists in active Hyprland entrypoint."""
-        self._ensure_hyprland_config_source_impl()
-
-    def set_hyprland_integration(self, enabled: bool) -> bool:
-        """Set Hyprland integration status"""
-        # 1. Strict Boolean Conversion
-        if isinstance(enabled, str):
-            is_enabled = enabled.lower() in ('true', '1', 'yes', 'on')
-        else:
-            is_enabled = bool(enabled)
-
-        log.info(f"set_hyprland_integration requested. Input: {enabled} -> Resolved: {is_enabled}")
-        self.hyprland_integration = is_enabled
-
-        try:
-            # 2. Update Config File
-            config = configparser.ConfigParser()
-            config.read(CONFIG_PATH)
-            
-            if 'General' not in config:
-                config['General'] = {}
-            
-            config['General']['HyprlandIntegration'] = str(is_enabled)
-            
-            with open(CONFIG_PATH, 'w') as f:
-                config.write(f)
-            
-            # 3. Execute Logic
-            if is_enabled:
-                log.info("Status: ENABLED. Activating Hyprland integration...")
-                try:
-                    self._ensure_hyprland_config_source()
-                    self._update_hyprland_visuals(self.last_known_profile)
-                except Exception as e:
-                    log.error(f"Error during activation: {e}")
-            else:
-                log.info("Status: DISABLED. Deactivating Hyprland integration...")
-                try:
-                    self._remove_hyprland_config_source()
-                except Exception as e:
-                    log.error(f"Error during deactivation: {e}")
-            
-            return True
-
-        except Exception as e:
-            log.error(f"Critical error in set_hyprland_integration: {e}")
-            return False
-
     def get_all_settings(self) -> Dict:
-        """Get all AcerSense daemon settings as a dictionary"""
+        """Get all AcerSense daemon settings, reusing a recent snapshot while it is fresh.
+        The returned dict is shared between callers and must not be modified."""
+        now = time.monotonic()
+        cached = self._settings_cache
+        if cached is not None and now - cached[0] < self.SETTINGS_CACHE_TTL:
+            return cached[1]
+        settings = self._collect_settings()
+        self._settings_cache = (now, settings)
+        return settings
+
+    def _collect_settings(self) -> Dict:
+        """Read all AcerSense daemon settings into a fresh dictionary"""
         settings = {
             "laptop_type": self.laptop_type.name,
             "has_four_zone_kb": self.has_four_zone_kb,
@@ -1978,13 +2346,105 @@ class AcerSenseManager:
 
 import asyncio
 
+# uvloop is optional: a libuv-based drop-in event loop, stdlib asyncio otherwise
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+class Response(NamedTuple):
+    """Reply to a client command; fields left as None are omitted from the JSON"""
+    success: bool
+    data: Any = None
+    error: Optional[str] = None
+    message: Optional[str] = None
+
+    def to_json(self) -> bytes:
+        return _json_dumps({k: v for k, v in zip(self._fields, self) if v is not None})
+
+def _requires_feature(feature: str, reply: Optional[str] = None):
+    """Decorate a DaemonServer command handler to reply 'not supported' when the feature is missing.
+    reply picks a different FEATURE_LABELS entry for the message (defaults to the feature itself)."""
+    reply = reply or feature
+    def decorator(handler):
+        @functools.wraps(handler)
+        def wrapper(self, params: Dict) -> Union[Response, bytes]:
+            if feature not in self.manager.available_features:
+                return self._err_unsupported[reply]
+            return handler(self, params)
+        return wrapper
+    return decorator
+
 class DaemonServer:
     """Asyncio Unix Socket server for IPC with the GUI client"""
 
+    # Human-readable feature names used in "not supported" replies
+    FEATURE_LABELS = {
+        "thermal_profile": "Thermal profile",
+        "backlight_timeout": "Backlight timeout",
+        "battery_calibration": "Battery calibration",
+        "battery_limiter": "Battery limiter",
+        "boot_animation_sound": "Boot animation sound",
+        "fan_speed": "Fan speed control",
+        "fan_speed_read": "Fan speed", # get_fan_rpms reports reads, not control
+        "lcd_override": "LCD override",
+        "usb_charging": "USB charging control",
+        "per_zone_mode": "Per-zone keyboard mode",
+        "four_zone_mode": "Four-zone keyboard mode",
+    }
+
+    # Window in which repeated events of the same type collapse into one broadcast
+    EVENT_COALESCE_DELAY = 0.02
+
     def __init__(self, manager: AcerSenseManager):
         self.manager = manager
+        # These replies never change, so serialize (and frame) them once
+        self._err_unsupported = {
+            feature: Response(False, error=f"{label} is not supported on this device").to_json() + b'\n'
+            for feature, label in self.FEATURE_LABELS.items()
+        }
+        self._settings_reply = (None, b'') # (settings dict, framed reply bytes)
+        self._last_event = (None, b'') # (event key, framed event bytes)
+        self._pending_events = {} # event type -> latest data, flushed by _flush_events
+        self._flush_scheduled = False
+        self._in_flight = {} # command -> task shared by concurrent identical reads
+        # Command name -> handler, looked up once per request
+        self._handlers = {
+            "get_all_settings": self._cmd_get_all_settings,
+            "get_fan_rpms": self._cmd_get_fan_rpms,
+            "get_thermal_profile": self._cmd_get_thermal_profile,
+            "set_thermal_profile": self._cmd_set_thermal_profile,
+            "set_backlight_timeout": self._cmd_set_backlight_timeout,
+            "set_battery_calibration": self._cmd_set_battery_calibration,
+            "set_battery_limiter": self._cmd_set_battery_limiter,
+            "set_boot_animation_sound": self._cmd_set_boot_animation_sound,
+            "set_fan_speed": self._cmd_set_fan_speed,
+            "set_lcd_override": self._cmd_set_lcd_override,
+            "set_usb_charging": self._cmd_set_usb_charging,
+            "set_per_zone_mode": self._cmd_set_per_zone_mode,
+            "set_four_zone_mode": self._cmd_set_four_zone_mode,
+            "set_hyprland_integration": self._cmd_set_hyprland_integration,
+            "set_logging_state": self._cmd_set_logging_state,
+            "set_default_profile_preference": self._cmd_set_default_profile_preference,
+            "set_hyprland_opacity_settings": self._cmd_set_hyprland_opacity_settings,
+            "get_supported_features": self._cmd_get_supported_features,
+            "get_version": self._cmd_get_version,
+            "force_nitro_model": self._cmd_force_nitro_model,
+            "force_predator_model": self._cmd_force_predator_model,
+            "force_enable_all": self._cmd_force_enable_all,
+            "get_modprobe_parameter": self._cmd_get_modprobe_parameter,
+            "set_modprobe_parameter_nitro": self._cmd_set_modprobe_parameter_nitro,
+            "set_modprobe_parameter_predator": self._cmd_set_modprobe_parameter_predator,
+            "set_modprobe_parameter_enable_all": self._cmd_set_modprobe_parameter_enable_all,
+            "remove_modprobe_parameter": self._cmd_remove_modprobe_parameter,
+            "restart_daemon": self._cmd_restart_daemon,
+            "restart_drivers_and_daemon": self._cmd_restart_drivers_and_daemon,
+            "cycle_profile": self._cmd_cycle_profile,
+            "activate_nos": self._cmd_activate_nos,
+            "deactivate_nos": self._cmd_deactivate_nos,
+        }
         self.server = None
-        self.clients = set() # Set of (reader, writer) tuples
+        self.clients = {} # writer -> reader
         self.running = False
         
         # Register ourselves as the event handler for the manager
@@ -1997,12 +2457,10 @@ class DaemonServer:
         self.loop = asyncio.get_running_loop()
         
         # Register callback bridge
-        # When manager calls this, we schedule the broadcast on the event loop
+        # When manager calls this (from any thread), we queue the event on the event loop
         def sync_callback(event_type, data):
             if self.loop and self.running:
-                self.loop.call_soon_threadsafe(
-                    lambda: asyncio.create_task(self.broadcast_event(event_type, data))
-                )
+                self.loop.call_soon_threadsafe(self._queue_event, event_type, data)
         
         self.manager.register_event_callback(sync_callback)
 
@@ -2038,6 +2496,27 @@ class DaemonServer:
         finally:
             self.cleanup_socket()
 
+    def _queue_event(self, event_type: str, data: Dict):
+        """Queue an event (loop thread only); repeats of a type within the window keep the latest data"""
+        self._pending_events[event_type] = data
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            self.loop.call_later(self.EVENT_COALESCE_DELAY, self._flush_events)
+
+    def _flush_events(self):
+        """Broadcast every queued event once"""
+        pending, self._pending_events = self._pending_events, {}
+        self._flush_scheduled = False
+        for event_type, data in pending.items():
+            task = self.loop.create_task(self.broadcast_event(event_type, data))
+            task.add_done_callback(self._log_broadcast_failure)
+
+    @staticmethod
+    def _log_broadcast_failure(future):
+        """Surface errors from broadcasts scheduled by the callback bridge"""
+        if not future.cancelled() and future.exception() is not None:
+            log.error(f"Broadcast task failed: {future.exception()}")
+
     def stop(self):
         """Stop the server"""
         log.info("Stopping server...")
@@ -2045,8 +2524,8 @@ class DaemonServer:
         if self.server:
             self.server.close()
         
-        # Close all clients
-        for _, writer in list(self.clients):
+        # Close all clients (close() only schedules teardown, so the dict is not mutated here)
+        for writer in self.clients:
             try:
                 writer.close()
             except:
@@ -2066,7 +2545,7 @@ class DaemonServer:
         """Handle async communication with a client"""
         client_peer = writer.get_extra_info('peername')
         # log.debug(f"New connection: {client_peer}")
-        self.clients.add((reader, writer))
+        self.clients[writer] = reader
 
         # Removing automatic sync_full_state on connection to prevent infinite 
         # hyprctl reload loops when simple event listeners connect to the socket.
@@ -2080,19 +2559,27 @@ class DaemonServer:
                     break
 
                 try:
-                    message = data.decode('utf-8').strip()
-                    if not message: continue
+                    if not data.strip(): continue
                     
-                    request = json.loads(message)
+                    request = _json_loads(data)
                     command = request.get("command", "")
                     params = request.get("params", {})
 
-                    # Process command (Sync logic for now)
-                    response = self.process_command(command, params)
+                    # Commands that only touch in-memory state run inline; anything doing
+                    # sysfs or subprocess work goes to the default executor so the loop keeps serving
+                    if command in self.INLINE_COMMANDS:
+                        response = self.process_command(command, params)
+                    elif command in self.COALESCED_COMMANDS:
+                        response = await self._coalesced_command(command)
+                    else:
+                        response = await self.loop.run_in_executor(None, self.process_command, command, params)
 
-                    # Send response with Newline Delimiter
-                    response_data = json.dumps(response).encode('utf-8') + b'\n'
-                    writer.write(response_data)
+                    # Send response with Newline Delimiter (pre-serialized replies are already framed).
+                    # writelines hands payload and delimiter over together instead of concatenating them
+                    if isinstance(response, bytes):
+                        writer.write(response)
+                    else:
+                        writer.writelines((response.to_json(), b'\n'))
                     await writer.drain()
 
                 except json.JSONDecodeError:
@@ -2109,546 +2596,393 @@ class DaemonServer:
             # Common disconnect error
             pass
         finally:
-            self.clients.discard((reader, writer))
+            self.clients.pop(writer, None)
             try:
                 writer.close()
                 await writer.wait_closed()
             except:
                 pass
 
+    @staticmethod
+    async def _send_one(writer, message: bytes):
+        """Write one framed message to a client and wait for it to flush"""
+        writer.write(message)
+        await writer.drain()
+
     async def broadcast_event(self, event_type: str, data: Dict):
         """Send a JSON event to all connected clients"""
         if not self.clients:
             return
 
-        payload = {
-            "type": "event",
-            "event": event_type,
-            "data": data
-        }
-        
         try:
-            # Add Newline Delimiter for Framing
-            message = json.dumps(payload).encode('utf-8') + b'\n'
-            log.debug(f"Broadcasting event: {event_type} to {len(self.clients)} clients")
-            
-            stale_clients = []
-            
-            for reader, writer in self.clients:
-                try:
-                    writer.write(message)
-                    await writer.drain()
-                except Exception:
-                    stale_clients.append((reader, writer))
+            # Repeated events (same type, same flat data) reuse the last encoded message
+            try:
+                key = (event_type, frozenset(data.items()))
+            except (AttributeError, TypeError):
+                key = None # Nested or non-dict data; always serialize
+            if key is not None and key == self._last_event[0]:
+                message = self._last_event[1]
+            else:
+                # Add Newline Delimiter for Framing
+                message = _json_dumps({"type": "event", "event": event_type, "data": data}) + b'\n'
+                if key is not None:
+                    self._last_event = (key, message)
+            log.debug("Broadcasting event: %s to %d clients", event_type, len(self.clients))
+            
+            # Drain all clients concurrently so one slow reader cannot stall the rest
+            writers = list(self.clients)
+            results = await asyncio.gather(
+                *(self._send_one(writer, message) for writer in writers),
+                return_exceptions=True
+            )
             
             # Cleanup disconnected clients found during broadcast
-            for client in stale_clients:
-                self.clients.discard(client)
+            for writer, result in zip(writers, results):
+                if isinstance(result, Exception):
+                    self.clients.pop(writer, None)
                 
         except Exception as e:
             log.error(f"Broadcast error: {e}")
 
-    def process_command(self, command: str, params: Dict) -> Dict:
-        """Process a command from the client"""
-        
-        # Filter noise from repetitive polling commands
-        NOISY_COMMANDS = ["get_thermal_profile", "get_fan_speed", "get_fan_rpms", "get_all_settings", "get_supported_features"]
-
+    # Commands answered from memory, cheap enough to run on the event loop
+    INLINE_COMMANDS = frozenset(("get_version", "get_supported_features"))
+
+    # Idempotent, parameterless reads; concurrent requests share one execution and one encoded reply
+    COALESCED_COMMANDS = frozenset(("get_all_settings", "get_thermal_profile", "get_fan_rpms"))
+
+    # Repetitive polling commands, logged at DEBUG only
+    NOISY_COMMANDS = frozenset(("get_thermal_profile", "get_fan_speed", "get_fan_rpms", "get_all_settings", "get_supported_features"))
+
+    async def _coalesced_command(self, command: str) -> bytes:
+        """Run a COALESCED_COMMANDS read, joining an identical request that is already in flight"""
+        task = self._in_flight.get(command)
+        if task is None:
+            task = self.loop.create_task(self._run_shared_command(command))
+            self._in_flight[command] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(command, None))
+        # Shielded so one client disconnecting does not cancel the read for the others
+        return await asyncio.shield(task)
+
+    async def _run_shared_command(self, command: str) -> bytes:
+        """Execute a command in the executor and return its framed reply bytes"""
+        response = await self.loop.run_in_executor(None, self.process_command, command, {})
+        if isinstance(response, bytes):
+            return response
+        return response.to_json() + b'\n'
+
+    def process_command(self, command: str, params: Dict) -> Union[Response, bytes]:
+        """Process a command from the client (bytes replies are pre-serialized)"""
         if not self.manager.disable_logs:
-            if command in NOISY_COMMANDS:
-                log.debug(f"Processing command: {command} with params: {params}")
+            if command in self.NOISY_COMMANDS:
+                log.debug("Processing command: %s with params: %s", command, params)
             else:
                 log.info(f"Processing command: {command} with params: {params}")
 
+        handler = self._handlers.get(command)
+        if handler is None:
+            return Response(False, error=f"Unknown command: {command}")
+
         try:
-            if command == "get_all_settings":
-                settings = self.manager.get_all_settings()
-                return {
-                    "success": True,
-                    "data": settings
-                }
-
-            elif command == "get_fan_rpms":
-                if "fan_speed" not in self.manager.available_features:
-                    return {
-                        "success": False,
-                        "error": "Fan speed is not supported on this device"
-                    }
-                cpu_rpms, gpu_rpms = self.manager.get_fan_rpms()
-                return {
-                    "success": True,
-                    "data": {
-                        "cpu": cpu_rpms,
-                        "gpu": gpu_rpms
-                    }
-                }
-            elif command == "get_thermal_profile":
-                # Check if feature is available
-                if "thermal_profile" not in self.manager.available_features:
-                    return {
-                        "success": False,
-                        "error": "Thermal profile is not supported on this device"
-                    }
-
-                profile = self.manager.get_thermal_profile()
-                choices = self.manager.get_thermal_profile_choices()
-                return {
-                    "success": True,
-                    "data": {
-                        "current": profile,
-                        "available": choices
-                    }
-                }
-
-            elif command == "set_thermal_profile":
-                # Check if feature is available
-                if "thermal_profile" not in self.manager.available_features:
-                    return {
-                        "success": False,
-                        "error": "Thermal profile is not supported on this device"
-                    }
-
-                profile = params.get("profile", "")
-                success = self.manager.set_thermal_profile(profile)
-                return {
-                    "success": success,
-                    "data": {"profile": profile} if success else None,
-                    "error": "Failed to set thermal profile" if not success else None
-                }
-
-            elif command == "set_backlight_timeout":
-                # Check if feature is available
-                if "backlight_timeout" not in self.manager.available_features:
-                    return {
-                        "success": False,
-                        "error": "Backlight timeout is not supported on this device"
-                    }
-
-                enabled = params.get("enabled", False)
-                success = self.manager.set_backlight_timeout(enabled)
-                return {
-                    "success": success,
-                    "data": {"enabled": enabled} if success else None,
-                    "error": "Failed to set backlight timeout" if not success else None
-                }
-
-            elif command == "set_battery_calibration":
-                # Check if feature is available
-                if "battery_calibration" not in self.manager.available_features:
-                    return {
-                        "success": False,
-                        "error": "Battery calibration is not supported on this device"
-                    }
-
-                enabled = params.get("enabled", False)
-                success = self.manager.set_battery_calibration(enabled)
-                return {
-                    "success": success,
-                    "data": {"enabled": enabled} if success else None,
-                    "error": "Failed to set battery calibration" if not success else None
-                }
-
-            elif command == "set_battery_limiter":
-                # Check if feature is available
-                if "battery_limiter" not in self.manager.available_features:
-                    return {
-                        "success": False,
-                        "error": "Battery limiter is not supported on this device"
-                    }
-
-                enabled = params.get("enabled", False)
-                success = self.manager.set_battery_limiter(enabled)
-                return {
-                    "success": success,
-                    "data": {"enabled": enabled} if success else None,
-                    "error": "Failed to set battery limiter" if not success else None
-                }
-
-            elif command == "set_boot_animation_sound":
-                # Check if feature is available
-                if "boot_animation_sound" not in self.manager.available_features:
-                    return {
-                        "success": False,
-                        "error": "Boot animation sound is not supported on this device"
-                    }
-
-                enabled = params.get("enabled", False)
-                success = self.manager.set_boot_animation_sound(enabled)
-                return {
-                    "success": success,
-                    "data": {"enabled": enabled} if success else None,
-                    "error": "Failed to set boot animation sound" if not success else None
-                }
-
-            elif command == "set_fan_speed":
-                # Check if feature is available
-                if "fan_speed" not in self.manager.available_features:
-                    return {
-                        "success": False,
-                        "error": "Fan speed control is not supported on this device"
-                    }
-
-                cpu = params.get("cpu", 0)
-                gpu = params.get("gpu", 0)
-                success = self.manager.set_fan_speed(cpu, gpu)
-                return {
-                    "success": success,
-                    "data": {"cpu": cpu, "gpu": gpu} if success else None,
-                    "error": "Failed to set fan speed" if not success else None
-                }
-
-            elif command == "set_lcd_override":
-                # Check if feature is available
-                if "lcd_override" not in self.manager.available_features:
-                    return {
-                        "success": False,
-                        "error": "LCD override is not supported on this device"
-                    }
-
-                enabled = params.get("enabled", False)
-                success = self.manager.set_lcd_override(enabled)
-                return {
-                    "success": success,
-                    "data": {"enabled": enabled} if success else None,
-                    "error": "Failed to set LCD override" if not success else None
-                }
-
-            elif command == "set_usb_charging":
-                # Check if feature is available
-                if "usb_charging" not in self.manager.available_features:
-                    return {
-                        "success": False,
-                        "error": "USB charging control is not supported on this device"
-                    }
-
-                level = params.get("level", 0)
-                success = self.manager.set_usb_charging(level)
-                return {
-                    "success": success,
-                    "data": {"level": level} if success else None,
-                    "error": "Failed to set USB charging" if not success else None
-                }
-
-            elif command == "set_per_zone_mode":
-                # Check if feature is available
-                if "per_zone_mode" not in self.manager.available_features:
-                    return {
-                        "success": False,
-                        "error": "Per-zone keyboard mode is not supported on this device"
-                    }
-
-                zone1 = params.get("zone1", "000000")
-                zone2 = params.get("zone2", "000000")
-                zone3 = params.get("zone3", "000000")
-                zone4 = params.get("zone4", "000000")
-                brightness = params.get("brightness", 100)
-                success = self.manager.set_per_zone_mode(zone1, zone2, zone3, zone4, brightness)
-                return {
-                    "success": success,
-                    "data": {
-                        "zone1": zone1,
-                        "zone2": zone2,
-                        "zone3": zone3,
-                        "zone4": zone4,
-                        "brightness": brightness
-                    } if success else None,
-                    "error": "Failed to set per-zone mode" if not success else None
-                }
-
-            elif command == "set_four_zone_mode":
-                # Check if feature is available
-                if "four_zone_mode" not in self.manager.available_features:
-                    return {
-                        "success": False,
-                        "error": "Four-zone keyboard mode is not supported on this device"
-                    }
-
-                mode = params.get("mode", 0)
-                speed = params.get("speed", 0)
-                brightness = params.get("brightness", 100)
-                direction = params.get("direction", 1)
-                red = params.get("red", 0)
-                green = params.get("green", 0)
-                blue = params.get("blue", 0)
-                success = self.manager.set_four_zone_mode(mode, speed, brightness, direction, red, green, blue)
-                return {
-                    "success": success,
-                    "data": {
-                        "mode": mode,
-                        "speed": speed,
-                        "brightness": brightness,
-                        "direction": direction,
-                        "red": red,
-                        "green": green,
-                        "blue": blue
-                    } if success else None,
-                    "error": "Failed to set four-zone mode" if not success else None
-                }
-
-            elif command == "set_hyprland_integration":
-                enabled = params.get("enabled", False)
-                success = self.manager.set_hyprland_integration(enabled)
-                return {
-                    "success": success,
-                    "data": {"enabled": enabled} if success else None,
-                    "error": "Failed to set Hyprland integration" if not success else None
-                }
-
-            elif command == "set_logging_state":
-                disabled = params.get("disabled", False)
-                success = self.manager.set_logging_state(disabled)
-                return {
-                    "success": success,
-                    "data": {"disabled": disabled} if success else None,
-                    "error": "Failed to set logging state" if not success else None
-                }
-
-            elif command == "set_default_profile_preference":
-                source = params.get("source", "")
-                profile = params.get("profile", "")
-                success = self.manager.set_default_profile_preference(source, profile)
-                return {
-                    "success": success,
-                    "data": {"source": source, "profile": profile} if success else None,
-                    "error": "Failed to set default profile preference" if not success else None
-                }
-
-            elif command == "set_hyprland_opacity_settings":
-                ac_active = float(params.get("ac_active", 0.97))
-                ac_inactive = float(params.get("ac_inactive", 0.95))
-                bat_active = float(params.get("bat_active", 1.0))
-                bat_inactive = float(params.get("bat_inactive", 1.0))
-                success = self.manager.set_hyprland_opacity_settings(ac_active, ac_inactive, bat_active, bat_inactive)
-                return {
-                    "success": success,
-                    "data": None,
-                    "error": "Failed to set opacity settings" if not success else None
-                }
-
-            elif command == "get_supported_features":
-                return {
-                    "success": True,
-                    "data": {
-                        "available_features": list(self.manager.available_features),
-                        "laptop_type": self.manager.laptop_type.name,
-                        "has_four_zone_kb": self.manager.has_four_zone_kb
-                    }
-                }
-
-            elif command == "get_version":
-                return {
-                    "success": True,
-                    "data": {
-                        "version": VERSION
-                    }
-                }
-            
-            # Force Models and Features
-            elif command == "force_nitro_model":
-                # Force Nitro model into driver
-                success = self.manager._force_model_nitro()
-                if success:
-                    return {
-                        "success": True,
-                        "message": "Successfully forced Nitro model into driver"
-                    }
-                else:
-                    return {
-                        "success": False,
-                        "error": "Failed to force Nitro model into driver"
-                    }
-                
-            elif command == "force_predator_model":
-                # Force Predator model into driver
-                success = self.manager._force_model_predator()
-                if success:
-                    return {
-                        "success": True,
-                        "message": "Successfully forced Predator model into driver"
-                    }
-                else:
-                    return {
-                        "success": False,
-                        "error": "Failed to force Predator model into driver (Model may not support it)"
-                    }
-
-            elif command == "force_enable_all":
-                # Force Enable All Features into driver
-                success = self.manager._force_enable_all()
-                if success:
-                    return {
-                        "success": True,
-                        "message": "Successfully forced all features into driver"
-                    }
-                else:
-                    return {
-                        "success": False,
-                        "error": "Failed to force all features into driver (Model may not support it)"
-                    }
-                
-            elif command == "get_modprobe_parameter":
-                print (self.manager.get_modprobe_parameter())
-                return {
-                    "success": True,
-                    "data": {
-                        "parameter": self.manager.get_modprobe_parameter()
-                    }
-                }
-
-            # Force Model and Parameters Permanantly
-            elif command == "set_modprobe_parameter_nitro":
-                success = self.manager.set_modprobe_parameter("nitro_v4")
-                return {
-                    "success": success,
-                    "data": {"parameter": param} if success else None,
-                    "error": "Failed to set modprobe parameter" if not success else None
-                }
-            
-            elif command == "set_modprobe_parameter_predator":
-                param = params.get("parameter", "")
-                success = self.manager.set_modprobe_parameter("predator_v4")
-                return {
-                    "success": success,
-                    "data": {"parameter": param} if success else None,
-                    "error": "Failed to set modprobe parameter" if not success else None
-                }
-            
-            elif command == "set_modprobe_parameter_enable_all":
-                param = params.get("parameter", "")
-                success = self.manager.set_modprobe_parameter("enable_all")
-                return {
-                    "success": success,
-                    "data": {"parameter": param} if success else None,
-                    "error": "Failed to set modprobe parameter" if not success else None
-                }
-
-            elif command == "remove_modprobe_parameter":
-                success = self.manager._remove_modprobe_parameter()
-                return {
-                    "success": success,
-                    "message": "Successfully removed modprobe parameter" if success else None,
-                    "error": "Failed to remove modprobe parameter" if not success else None
-                }
-            
-            elif command == "restart_daemon":
-                # Force Nitro model into driver
-                success = self.manager._restart_daemon()
-                if success:
-                    return {
-                        "success": True,
-                        "message": "Successfully restarted AcerSense daemon"
-                    }
-                else:
-                    return {
-                        "success": False,
-                        "error": "Failed to Restart AcerSense daemon (Check logs for details)"
-                    }           
-
-            elif command == "restart_drivers_and_daemon":
-                # Restart linuwu-sense driver and AcerSense daemon service
-                success = self.manager._restart_drivers_and_daemon()
-                if success:
-                    return {
-                        "success": True,
-                        "message": "Successfully restarted drivers and AcerSense daemon"
-                    }
-                else:
-                    return {
-                        "success": False,
-                        "error": "Failed to restart drivers and AcerSense daemon"
-                    }
-            
-            elif command == "cycle_profile":
-                # Trust our internal state first to prevent race conditions
-                current_profile = self.manager.last_known_profile
-                
-                # Fallback to reading real state if internal state is missing
-                if not current_profile:
-                    current_profile = self.manager.get_thermal_profile()
-                
-                if not current_profile:
-                    return {"success": False, "error": "Could not read current thermal profile."}
+            if command in self.COALESCED_COMMANDS or command in self.INLINE_COMMANDS:
+                return handler(params) # Read-only
+            # Check-then-set handlers (NOS, profiles, Hyprland edits) must not interleave between clients
+            with self.manager.command_lock:
+                return handler(params)
+        except Exception as e:
+            log.error(f"Error processing command {command}: {e}")
+            log.error(traceback.format_exc())
+            return Response(False, error=str(e))
+
+    def _cmd_get_all_settings(self, params: Dict) -> bytes:
+        settings = self.manager.get_all_settings()
+        # The manager hands back the same dict while its snapshot is fresh; reuse the encoded reply too
+        if settings is not self._settings_reply[0]:
+            self._settings_reply = (settings, Response(True, settings).to_json() + b'\n')
+        return self._settings_reply[1]
+
+    @_requires_feature("fan_speed", reply="fan_speed_read")
+    def _cmd_get_fan_rpms(self, params: Dict) -> Response:
+        cpu_rpms, gpu_rpms = self.manager.get_fan_rpms()
+        return Response(True, {
+            "cpu": cpu_rpms,
+            "gpu": gpu_rpms
+        })
+
+    @_requires_feature("thermal_profile")
+    def _cmd_get_thermal_profile(self, params: Dict) -> Response:
+        profile = self.manager.get_thermal_profile()
+        choices = self.manager.get_thermal_profile_choices()
+        return Response(True, {
+            "current": profile,
+            "available": choices
+        })
+
+    @_requires_feature("thermal_profile")
+    def _cmd_set_thermal_profile(self, params: Dict) -> Response:
+        profile = params.get("profile", "")
+        if not self.manager.set_thermal_profile(profile):
+            return Response(False, error="Failed to set thermal profile")
+        return Response(True, {"profile": profile})
+
+    @_requires_feature("backlight_timeout")
+    def _cmd_set_backlight_timeout(self, params: Dict) -> Response:
+        enabled = params.get("enabled", False)
+        if not self.manager.set_backlight_timeout(enabled):
+            return Response(False, error="Failed to set backlight timeout")
+        return Response(True, {"enabled": enabled})
+
+    @_requires_feature("battery_calibration")
+    def _cmd_set_battery_calibration(self, params: Dict) -> Response:
+        enabled = params.get("enabled", False)
+        if not self.manager.set_battery_calibration(enabled):
+            return Response(False, error="Failed to set battery calibration")
+        return Response(True, {"enabled": enabled})
+
+    @_requires_feature("battery_limiter")
+    def _cmd_set_battery_limiter(self, params: Dict) -> Response:
+        enabled = params.get("enabled", False)
+        if not self.manager.set_battery_limiter(enabled):
+            return Response(False, error="Failed to set battery limiter")
+        return Response(True, {"enabled": enabled})
+
+    @_requires_feature("boot_animation_sound")
+    def _cmd_set_boot_animation_sound(self, params: Dict) -> Response:
+        enabled = params.get("enabled", False)
+        if not self.manager.set_boot_animation_sound(enabled):
+            return Response(False, error="Failed to set boot animation sound")
+        return Response(True, {"enabled": enabled})
+
+    @_requires_feature("fan_speed")
+    def _cmd_set_fan_speed(self, params: Dict) -> Response:
+        cpu = params.get("cpu", 0)
+        gpu = params.get("gpu", 0)
+        if not self.manager.set_fan_speed(cpu, gpu):
+            return Response(False, error="Failed to set fan speed")
+        return Response(True, {"cpu": cpu, "gpu": gpu})
+
+    @_requires_feature("lcd_override")
+    def _cmd_set_lcd_override(self, params: Dict) -> Response:
+        enabled = params.get("enabled", False)
+        if not self.manager.set_lcd_override(enabled):
+            return Response(False, error="Failed to set LCD override")
+        return Response(True, {"enabled": enabled})
+
+    @_requires_feature("usb_charging")
+    def _cmd_set_usb_charging(self, params: Dict) -> Response:
+        level = params.get("level", 0)
+        if not self.manager.set_usb_charging(level):
+            return Response(False, error="Failed to set USB charging")
+        return Response(True, {"level": level})
+
+    @_requires_feature("per_zone_mode")
+    def _cmd_set_per_zone_mode(self, params: Dict) -> Response:
+        zone1 = params.get("zone1", "000000")
+        zone2 = params.get("zone2", "000000")
+        zone3 = params.get("zone3", "000000")
+        zone4 = params.get("zone4", "000000")
+        brightness = params.get("brightness", 100)
+        if not self.manager.set_per_zone_mode(zone1, zone2, zone3, zone4, brightness):
+            return Response(False, error="Failed to set per-zone mode")
+        return Response(True, {
+            "zone1": zone1,
+            "zone2": zone2,
+            "zone3": zone3,
+            "zone4": zone4,
+            "brightness": brightness
+        })
+
+    @_requires_feature("four_zone_mode")
+    def _cmd_set_four_zone_mode(self, params: Dict) -> Response:
+        mode = params.get("mode", 0)
+        speed = params.get("speed", 0)
+        brightness = params.get("brightness", 100)
+        direction = params.get("direction", 1)
+        red = params.get("red", 0)
+        green = params.get("green", 0)
+        blue = params.get("blue", 0)
+        if not self.manager.set_four_zone_mode(mode, speed, brightness, direction, red, green, blue):
+            return Response(False, error="Failed to set four-zone mode")
+        return Response(True, {
+            "mode": mode,
+            "speed": speed,
+            "brightness": brightness,
+            "direction": direction,
+            "red": red,
+            "green": green,
+            "blue": blue
+        })
+
+    def _cmd_set_hyprland_integration(self, params: Dict) -> Response:
+        enabled = params.get("enabled", False)
+        if not self.manager.set_hyprland_integration(enabled):
+            return Response(False, error="Failed to set Hyprland integration")
+        return Response(True, {"enabled": enabled})
+
+    def _cmd_set_logging_state(self, params: Dict) -> Response:
+        disabled = params.get("disabled", False)
+        if not self.manager.set_logging_state(disabled):
+            return Response(False, error="Failed to set logging state")
+        return Response(True, {"disabled": disabled})
+
+    def _cmd_set_default_profile_preference(self, params: Dict) -> Response:
+        source = params.get("source", "")
+        profile = params.get("profile", "")
+        if not self.manager.set_default_profile_preference(source, profile):
+            return Response(False, error="Failed to set default profile preference")
+        return Response(True, {"source": source, "profile": profile})
+
+    def _cmd_set_hyprland_opacity_settings(self, params: Dict) -> Response:
+        ac_active = float(params.get("ac_active", 0.97))
+        ac_inactive = float(params.get("ac_inactive", 0.95))
+        bat_active = float(params.get("bat_active", 1.0))
+        bat_inactive = float(params.get("bat_inactive", 1.0))
+        if not self.manager.set_hyprland_opacity_settings(ac_active, ac_inactive, bat_active, bat_inactive):
+            return Response(False, error="Failed to set opacity settings")
+        return Response(True)
+
+    def _cmd_get_supported_features(self, params: Dict) -> Response:
+        return Response(True, {
+            "available_features": list(self.manager.available_features),
+            "laptop_type": self.manager.laptop_type.name,
+            "has_four_zone_kb": self.manager.has_four_zone_kb
+        })
+
+    def _cmd_get_version(self, params: Dict) -> Response:
+        return Response(True, {"version": VERSION})
+
+    # Force Models and Features
+    def _cmd_force_nitro_model(self, params: Dict) -> Response:
+        # Force Nitro model into driver
+        if self.manager._force_model_nitro():
+            return Response(True, message="Successfully forced Nitro model into driver")
+        return Response(False, error="Failed to force Nitro model into driver")
+
+    def _cmd_force_predator_model(self, params: Dict) -> Response:
+        # Force Predator model into driver
+        if self.manager._force_model_predator():
+            return Response(True, message="Successfully forced Predator model into driver")
+        return Response(False, error="Failed to force Predator model into driver (Model may not support it)")
+
+    def _cmd_force_enable_all(self, params: Dict) -> Response:
+        # Force Enable All Features into driver
+        if self.manager._force_enable_all():
+            return Response(True, message="Successfully forced all features into driver")
+        return Response(False, error="Failed to force all features into driver (Model may not support it)")
+
+    def _cmd_get_modprobe_parameter(self, params: Dict) -> Response:
+        param = self.manager.get_modprobe_parameter()
+        log.debug(f"Current modprobe parameter: {param}")
+        return Response(True, {"parameter": param})
+
+    # Force Model and Parameters Permanantly
+    def _cmd_set_modprobe_parameter_nitro(self, params: Dict) -> Response:
+        param = params.get("parameter", "")
+        if not self.manager.set_modprobe_parameter("nitro_v4"):
+            return Response(False, error="Failed to set modprobe parameter")
+        return Response(True, {"parameter": param})
+
+    def _cmd_set_modprobe_parameter_predator(self, params: Dict) -> Response:
+        param = params.get("parameter", "")
+        if not self.manager.set_modprobe_parameter("predator_v4"):
+            return Response(False, error="Failed to set modprobe parameter")
+        return Response(True, {"parameter": param})
+
+    def _cmd_set_modprobe_parameter_enable_all(self, params: Dict) -> Response:
+        param = params.get("parameter", "")
+        if not self.manager.set_modprobe_parameter("enable_all"):
+            return Response(False, error="Failed to set modprobe parameter")
+        return Response(True, {"parameter": param})
+
+    def _cmd_remove_modprobe_parameter(self, params: Dict) -> Response:
+        if self.manager._remove_modprobe_parameter():
+            return Response(True, message="Successfully removed modprobe parameter")
+        return Response(False, error="Failed to remove modprobe parameter")
+
+    def _cmd_restart_daemon(self, params: Dict) -> Response:
+        if self.manager._restart_daemon():
+            return Response(True, message="Successfully restarted AcerSense daemon")
+        return Response(False, error="Failed to Restart AcerSense daemon (Check logs for details)")
+
+    def _cmd_restart_drivers_and_daemon(self, params: Dict) -> Response:
+        # Restart linuwu-sense driver and AcerSense daemon service
+        if self.manager._restart_drivers_and_daemon():
+            return Response(True, message="Successfully restarted drivers and AcerSense daemon")
+        return Response(False, error="Failed to restart drivers and AcerSense daemon")
+
+    def _cmd_cycle_profile(self, params: Dict) -> Response:
+        # Trust our internal state first to prevent race conditions
+        current_profile = self.manager.last_known_profile
+
+        # Fallback to reading real state if internal state is missing
+        if not current_profile:
+            current_profile = self.manager.get_thermal_profile()
+
+        if not current_profile:
+            return Response(False, error="Could not read current thermal profile.")
+
+        is_ac = self.manager._is_ac_online()
+
+        available = self.manager._profile_choices_set
+        profiles = [p for p in (_AC_CYCLE_PROFILES if is_ac else _BAT_CYCLE_PROFILES) if p in available]
+
+        if not profiles:
+            return Response(False, error="No profiles available for cycling.")
+
+        # Find current index based on the real profile
+        try:
+            current_idx = profiles.index(current_profile)
+        except ValueError:
+            # If current profile is not in the list (e.g. 'performance'), start from the beginning
+            current_idx = -1
 
-                is_ac_online_path = next((p for p in ["/sys/class/power_supply/AC/online", "/sys/class/power_supply/ACAD/online", "/sys/class/power_supply/ADP1/online", "/sys/class/power_supply/AC0/online"] if os.path.exists(p)), None)
-                is_ac = self.manager._read_file(is_ac_online_path) == "1" if is_ac_online_path else False
-                
-                all_profiles = self.manager.get_thermal_profile_choices()
-                profiles_ac = [p for p in all_profiles if p in ["quiet", "balanced", "balanced-performance"]]
-                profiles_battery = [p for p in all_profiles if p in ["low-power", "balanced"]]
-                profiles = profiles_ac if is_ac else profiles_battery
-                
-                if not profiles:
-                    return {"success": False, "error": "No profiles available for cycling."}
+        next_idx = (current_idx + 1) % len(profiles)
+        next_profile = profiles[next_idx]
 
-                # Find current index based on the real profile
-                try:
-                    current_idx = profiles.index(current_profile)
-                except ValueError:
-                    # If current profile is not in the list (e.g. 'performance'), start from the beginning
-                    current_idx = -1
-                
-                next_idx = (current_idx + 1) % len(profiles)
-                next_profile = profiles[next_idx]
+        # TLP and custom logic removed - Manager handles optimizations now
+        self.manager.set_thermal_profile(next_profile)
 
-                # TLP and custom logic removed - Manager handles optimizations now
-                self.manager.set_thermal_profile(next_profile)
-                
-                return {"success": True, "data": {"new_profile": next_profile}}
+        return Response(True, {"new_profile": next_profile})
 
-            elif command == "activate_nos":
-                if not self.manager.nos_active:
-                    self.manager.nos_active = True
-                    # 1. Save current state
-                    self.manager.previous_profile_for_nos = self.manager.get_thermal_profile()
-                    
-                    # 2. Determine best profile (Performance if on AC, Balanced if on Battery)
-                    best_profile = "balanced-performance"
-                    available = self.manager.get_thermal_profile_choices()
-                    if self.manager._is_ac_online(): # Using internal helper instead of broken detector ref
-                        if "performance" in available: best_profile = "performance"
-                        elif "balanced-performance" in available: best_profile = "balanced-performance"
-                    else:
-                        if "balanced" in available: best_profile = "balanced"
-                    
-                    # 3. Apply
-                    if "fan_speed" in self.manager.available_features:
-                        self.manager.set_fan_speed(100, 100)
-                    self.manager.set_thermal_profile(best_profile)
-                    
-                    # 4. Instant Sync
-                    self.broadcast_event("thermal_profile_changed", {"profile": best_profile})
-                    self.broadcast_event("fan_speed_changed", {"cpu": "100", "gpu": "100"})
-                    
-                    return {"success": True, "message": "NOS Mode Activated"}
-                return {"success": False, "message": "NOS already active"}
-
-            elif command == "deactivate_nos":
-                if self.manager.nos_active:
-                    self.manager.nos_active = False
-                    if hasattr(self.manager, 'previous_profile_for_nos') and self.manager.previous_profile_for_nos:
-                        self.manager.set_thermal_profile(self.manager.previous_profile_for_nos)
-                    if "fan_speed" in self.manager.available_features:
-                        self.manager.set_fan_speed(0, 0)
-                    # Force events for GUI sync
-                    prev_p = getattr(self.manager, 'previous_profile_for_nos', "balanced")
-                    self.broadcast_event("thermal_profile_changed", {"profile": prev_p})
-                    self.broadcast_event("fan_speed_changed", {"cpu": "0", "gpu": "0"})
-                    return {"success": True, "message": "NOS Mode Deactivated"}
-                return {"success": False, "message": "NOS not active"}
+    def _cmd_activate_nos(self, params: Dict) -> Response:
+        if not self.manager.nos_active:
+            self.manager.nos_active = True
+            # 1. Save current state
+            self.manager.previous_profile_for_nos = self.manager.get_thermal_profile()
 
+            # 2. Determine best profile (Performance if on AC, Balanced if on Battery)
+            best_profile = "balanced-performance"
+            available = self.manager.get_thermal_profile_choices()
+            if self.manager._is_ac_online(): # Using internal helper instead of broken detector ref
+                if "performance" in available: best_profile = "performance"
+                elif "balanced-performance" in available: best_profile = "balanced-performance"
             else:
-                return {
-                    "success": False,
-                    "error": f"Unknown command: {command}"
-                }
-
-        except Exception as e:
-            log.error(f"Error processing command {command}: {e}")
-            log.error(traceback.format_exc())
-            return {
-                "success": False,
-                "error": str(e)
-            }
+                if "balanced" in available: best_profile = "balanced"
+
+            # 3. Apply
+            if "fan_speed" in self.manager.available_features:
+                self.manager.set_fan_speed(100, 100)
+            self.manager.set_thermal_profile(best_profile)
+
+            # 4. Instant Sync
+            self.manager._notify_event("thermal_profile_changed", {"profile": best_profile})
+            self.manager._notify_event("fan_speed_changed", {"cpu": "100", "gpu": "100"})
+
+            return Response(True, message="NOS Mode Activated")
+        return Response(False, message="NOS already active")
+
+    def _cmd_deactivate_nos(self, params: Dict) -> Response:
+        if self.manager.nos_active:
+            self.manager.nos_active = False
+            if hasattr(self.manager, 'previous_profile_for_nos') and self.manager.previous_profile_for_nos:
+                self.manager.set_thermal_profile(self.manager.previous_profile_for_nos)
+            if "fan_speed" in self.manager.available_features:
+                self.manager.set_fan_speed(0, 0)
+            # Force events for GUI sync
+            prev_p = getattr(self.manager, 'previous_profile_for_nos', "balanced")
+            self.manager._notify_event("thermal_profile_changed", {"profile": prev_p})
+            self.manager._notify_event("fan_speed_changed", {"cpu": "0", "gpu": "0"})
+            return Response(True, message="NOS Mode Deactivated")
+        return Response(False, message="NOS not active")
 
 
 class AcerSenseDaemon:
@@ -2658,7 +2992,11 @@ class AcerSenseDaemon:
         self.running = False
         self.manager = None
         self.server = None
+        self.power_monitor = None
         self.config = None
+        self._pid_fd = None # Locked PID file, held until cleanup()
+        self._stopping = False
+        self._owned_tasks = set() # Tasks created by the daemon itself; the only ones shutdown() waits for
 
     def load_config(self):
         """Load configuration from file"""
@@ -2675,7 +3013,8 @@ class AcerSenseDaemon:
             with open(CONFIG_PATH, 'w') as f:
                 config.write(f)
         else:
-            config.read(CONFIG_PATH)
+            # Shared with the manager's startup read of the same file
+            config = _read_config(CONFIG_PATH)
 
         self.config = config
         
@@ -2686,9 +3025,7 @@ class AcerSenseDaemon:
         if self.disable_logs:
             log.setLevel(logging.ERROR)
         else:
-            log_level = config['General'].get('LogLevel', 'INFO').upper()
-            level = getattr(logging, log_level, logging.INFO)
-            log.setLevel(level)
+            log.setLevel(_config_log_level(config['General']))
 
         # Load Hyprland Integration Setting
         self.hyprland_integration = config['General'].getboolean('HyprlandIntegration', fallback=False)
@@ -2709,7 +3046,7 @@ class AcerSenseDaemon:
             # Pass config setting to manager
             self.manager.hyprland_integration = getattr(self, 'hyprland_integration', False)
 
-            # Initialize power monitor
+            # Initialize power monitor; monitoring starts here, before the event loop runs
             self.power_monitor = PowerSourceDetector(self.manager)
             self.power_monitor.start_monitoring()
 
@@ -2726,28 +3063,57 @@ class AcerSenseDaemon:
     
 
 
-    async def run(self):
-        """Run the daemon"""
-        # Write PID file
-        with open(PID_FILE, 'w') as f:
-            f.write(str(os.getpid()))
+    def _write_pid_file(self) -> bool:
+        """Lock PID_FILE for the life of the process and write our PID into it.
+        The flock, not the recorded PID, decides whether another daemon is running."""
+        while True:
+            fd = os.open(PID_FILE, os.O_RDWR | os.O_CREAT | os.O_CLOEXEC, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                other_pid = os.read(fd, 32).strip().decode(errors='replace') or "unknown"
+                os.close(fd)
+                log.error(f"FATAL: Another AcerSense daemon is already running (PID {other_pid})")
+                return False
+            # A previous owner may have unlinked the file between our open and flock; lock the current one
+            try:
+                if os.stat(PID_FILE).st_ino == os.fstat(fd).st_ino:
+                    break
+            except FileNotFoundError:
+                pass
+            os.close(fd)
+
+        # Only truncate once the lock is ours, so a losing instance never clobbers the owner's PID
+        os.ftruncate(fd, 0)
+        os.write(fd, str(os.getpid()).encode())
+        self._pid_fd = fd # Kept open: closing it would release the lock
+        return True
+
+    def _release_pid_file(self):
+        """Remove PID_FILE while still holding its lock, then release it"""
+        if self._pid_fd is None:
+            return
+        try:
+            os.unlink(PID_FILE)
+        except OSError:
+            pass
+        os.close(self._pid_fd)
+        self._pid_fd = None
 
+    async def run(self):
+        """Run the daemon (the PID file is already held, see main())"""
         # Set up signal handlers for graceful shutdown
         loop = asyncio.get_running_loop()
         for sig in (signal.SIGTERM, signal.SIGINT):
-            loop.add_signal_handler(sig, lambda: asyncio.create_task(self.shutdown()))
+            loop.add_signal_handler(sig, self._on_signal)
 
         # Set up and run the server
         try:
             self.running = True
             self.server = DaemonServer(self.manager)
             
-            # Start power monitor
-            if self.power_monitor:
-                self.power_monitor.start_monitoring()
-            
             # Start Async Server
-            await self.server.start()
+            await self._spawn(self.server.start())
             
         except asyncio.CancelledError:
             pass
@@ -2757,14 +3123,29 @@ class AcerSenseDaemon:
         finally:
             self.cleanup()
 
+    def _on_signal(self):
+        """First SIGTERM/SIGINT shuts down gracefully; a second one exits immediately"""
+        if self._stopping:
+            log.warning("Received second stop signal, exiting immediately")
+            os._exit(1)
+        self._stopping = True
+        self._spawn(self.shutdown())
+
+    def _spawn(self, coro) -> asyncio.Task:
+        """Create a task owned by the daemon so shutdown() can cancel it"""
+        task = asyncio.create_task(coro)
+        self._owned_tasks.add(task)
+        task.add_done_callback(self._owned_tasks.discard)
+        return task
+
     async def shutdown(self):
         """Handle shutdown signal"""
         log.info("Received stop signal, shutting down...")
         self.running = False
         if self.server:
             self.server.stop()
-        # Cancel all running tasks
-        tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        # Cancel only the tasks we started; asyncio.run() reaps anything else on exit
+        tasks = [t for t in self._owned_tasks if t is not asyncio.current_task()]
         for task in tasks:
             task.cancel()
         await asyncio.gather(*tasks, return_exceptions=True)
@@ -2779,13 +3160,12 @@ class AcerSenseDaemon:
     
         if self.power_monitor:
             self.power_monitor.stop_monitoring()
+
+        if self.manager:
+            self.manager.close()
     
         # Remove PID file
-        try:
-            if os.path.exists(PID_FILE):
-                os.unlink(PID_FILE)
-        except:
-            pass
+        self._release_pid_file()
     
         log.info("Daemon stopped")
 
@@ -2798,6 +3178,14 @@ def parse_args():
     parser.add_argument('--config', type=str, help=f"Path to config file (default: {CONFIG_PATH})")
     return parser.parse_args()
 
+def _run_event_loop(coro):
+    """Run the daemon's main coroutine, on uvloop when it is installed"""
+    if uvloop is not None:
+        if hasattr(uvloop, "run"):
+            return uvloop.run(coro)
+        uvloop.install() # uvloop < 0.18
+    return asyncio.run(coro)
+
 def main():
     """Main function"""
     try:
@@ -2814,11 +3202,16 @@ def main():
             CONFIG_PATH = args.config
 
         daemon = AcerSenseDaemon()
+        # Claim the PID file before setup() touches drivers, profiles or starts monitoring,
+        # so a second instance exits without changing hardware state
+        if not daemon._write_pid_file():
+            sys.exit(1)
+
         if daemon.setup():
             try:
                 if not daemon.disable_logs:
                     log.info(f"Driver Version: {daemon.manager.get_driver_version()}")
-                asyncio.run(daemon.run())
+                _run_event_loop(daemon.run())
             except KeyboardInterrupt:
                 pass 
             except Exception as e:
@@ -2826,6 +3219,7 @@ def main():
                 sys.exit(1)
         else:
             log.error("FATAL: Daemon failed to set up during initialization.")
+            daemon.cleanup()
             sys.exit(1)
     except Exception as e:
         # Final safety net for errors before setup completes
@@ -2,18 +2,56 @@
 # AcerSense Power Source Detection - Monitors power source using Kernel Netlink Events (Instant)
 
 import os
+import ctypes
+import errno
 import logging
 import socket
 import select
+import struct
 import threading
 import time
 
 # Get logger from main daemon
 log = logging.getLogger("AcerSenseDaemon")
 
+SO_ATTACH_FILTER = getattr(socket, "SO_ATTACH_FILTER", 26) # Not exported by the socket module
+
+# Classic BPF program run by the kernel on every uevent before it is queued to us.
+# Power supply and platform profile updates are always "change@/devices/..." messages, so
+# anything else (add/remove/bind/unbind storms from USB, block, input...) is dropped in-kernel.
+# Each instruction is (code, jt, jf, k); words are loaded big-endian.
+_UEVENT_BPF = (
+    (0x20, 0, 0, 0),            # ld  [0]          (BPF_LD|BPF_W|BPF_ABS)
+    (0x15, 0, 3, 0x6368616e),   # jeq "chan"       (BPF_JMP|BPF_JEQ|BPF_K), else drop
+    (0x20, 0, 0, 4),            # ld  [4]
+    (0x15, 0, 1, 0x6765402f),   # jeq "ge@/", else drop
+    (0x06, 0, 0, 0xffffffff),   # ret whole packet (BPF_RET|BPF_K)
+    (0x06, 0, 0, 0),            # ret 0: drop
+)
+
+class _SockFprog(ctypes.Structure):
+    _fields_ = [("len", ctypes.c_ushort), ("filter", ctypes.c_void_p)]
+
+def _read_online(path) -> bool:
+    """Read a sysfs 'online' attribute ("0\n" or "1\n") with a single unbuffered read"""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        return os.read(fd, 1) == b"1"
+    finally:
+        os.close(fd)
+
 class PowerSourceDetector:
     """Detects power source and manages automatic mode switching using Netlink UEvents"""
 
+    # Quiet period (seconds) that ends a burst of uevents
+    BURST_WINDOW = 0.05
+    # Retry delays (seconds) after Netlink errors, and how many consecutive errors before polling
+    NETLINK_BACKOFF_MIN = 0.1
+    NETLINK_BACKOFF_MAX = 30.0
+    NETLINK_MAX_FAILURES = 5
+    # Kernel receive queue for uevents; the default is small enough to overflow during dock/USB storms
+    NETLINK_RCVBUF = 1 << 20
+
     def __init__(self, manager):
         self.manager = manager
         self.current_source = None
@@ -27,6 +65,12 @@ class PowerSourceDetector:
             "/sys/class/power_supply/ADP1/online",
             "/sys/class/power_supply/AC0/online"
         ]
+        # Receive buffer for uevents, allocated once
+        self._ev_buf = bytearray(16384)
+        # Winning path from the first successful probe, reused until it disappears
+        self._ac_online_path = None
+        # Set by stop_monitoring; lets the polling fallback stop without finishing its sleep
+        self._stop = threading.Event()
         
         log.info("PowerSourceDetector initialized")
 
@@ -36,6 +80,7 @@ class PowerSourceDetector:
             return
 
         self.running = True
+        self._stop.clear()
         
         # Perform initial check immediately
         self.current_source = self._is_ac_connected()
@@ -51,6 +96,7 @@ class PowerSourceDetector:
     def stop_monitoring(self):
         """Stop monitoring"""
         self.running = False
+        self._stop.set()
 
     def _monitor_loop(self):
         """Main loop that tries Netlink and falls back to polling if needed"""
@@ -74,58 +120,127 @@ class PowerSourceDetector:
             log.warning(f"Could not bind Netlink socket: {e}")
             raise # Re-raise to trigger fallback
 
-        poll_obj = select.poll()
-        poll_obj.register(sock, select.POLLIN)
+        self._attach_uevent_filter(sock)
+        self._grow_receive_buffer(sock)
+
+        # Edge-triggered epoll: one wakeup per burst, then drain the socket until it would block
+        ep = select.epoll()
+        ep.register(sock.fileno(), select.EPOLLIN | select.EPOLLET)
 
         log.info("Netlink socket bound successfully. Listening for kernel events...")
 
-        while self.running:
-            try:
-                # Poll indefinitely (-1). Wake up only when kernel sends an event.
-                # This eliminates the 2-second CPU 'poke'.
-                events = poll_obj.poll(-1)
-                
+        failures = 0
+        backoff = self.NETLINK_BACKOFF_MIN
+        try:
+            while self.running:
                 should_check_power = False
                 should_check_profile = False
-                
-                for fd, event in events:
-                    if fd == sock.fileno():
-                        # Receive event data
-                        data = sock.recv(16384)
-                        decoded = data.decode('utf-8', errors='replace')
-                        
-                        # Check for power supply events
-                        if "SUBSYSTEM=power_supply" in decoded:
-                            log.debug("Kernel Event: Power source change detected")
-                            should_check_power = True
-                        
-                        # Check for thermal profile events (platform_profile)
-                        if "platform_profile" in decoded:
-                            log.debug("Kernel Event: Thermal profile change detected")
-                            should_check_profile = True
-                
-                if should_check_power:
-                    # Give sysfs a tiny moment to update
-                    time.sleep(0.1)
-                    self.check_power_source()
-                
-                if should_check_profile:
-                    # Notify manager to sync state with hardware
-                    self.manager.handle_hardware_event()
-
-            except Exception as e:
-                log.error(f"Error in Netlink loop: {e}")
-                time.sleep(5) # Prevent tight loop on error
-
-        if sock:
+                try:
+                    # Wait indefinitely (-1). Wake up only when kernel sends an event.
+                    # This eliminates the 2-second CPU 'poke'.
+                    events = ep.poll(-1)
+                    
+                    # A plug/unplug arrives as several uevents; keep draining until the
+                    # socket stays quiet for BURST_WINDOW, then act once for the whole burst
+                    while events:
+                        power, profile = self._drain_uevents(sock)
+                        should_check_power |= power
+                        should_check_profile |= profile
+                        events = ep.poll(self.BURST_WINDOW)
+
+                    failures = 0
+                    backoff = self.NETLINK_BACKOFF_MIN
+
+                except OSError as e:
+                    # Only socket errors count towards giving up on Netlink
+                    failures += 1
+                    if failures > self.NETLINK_MAX_FAILURES:
+                        log.error(f"Netlink socket failed {failures} times in a row ({e}). Falling back to polling.")
+                        break
+                    log.error(f"Error in Netlink loop: {e}")
+                    # Back off exponentially instead of retrying a dead socket every 5s forever
+                    time.sleep(backoff)
+                    backoff = min(backoff * 2, self.NETLINK_BACKOFF_MAX)
+                    continue
+
+                # Handler errors are logged and the socket keeps listening
+                try:
+                    if should_check_power:
+                        # Give sysfs a tiny moment to update
+                        time.sleep(0.1)
+                        self.check_power_source()
+                except Exception as e:
+                    log.error(f"Error handling power source event: {e}")
+
+                try:
+                    if should_check_profile:
+                        # Notify manager to sync state with hardware
+                        self.manager.handle_hardware_event()
+                except Exception as e:
+                    log.error(f"Error handling thermal profile event: {e}")
+        finally:
+            ep.close()
             sock.close()
 
+        if failures > self.NETLINK_MAX_FAILURES:
+            self._monitor_polling()
+
+    def _attach_uevent_filter(self, sock):
+        """Let the kernel drop uninteresting uevents; the Python checks still apply afterwards"""
+        insns = b"".join(struct.pack("HBBI", *insn) for insn in _UEVENT_BPF)
+        buf = ctypes.create_string_buffer(insns)
+        prog = _SockFprog(len(_UEVENT_BPF), ctypes.addressof(buf))
+        try:
+            # The kernel copies the program, so the buffers only need to live for this call
+            sock.setsockopt(socket.SOL_SOCKET, SO_ATTACH_FILTER, bytes(prog))
+            log.debug("Attached uevent socket filter")
+        except OSError as e:
+            log.debug("Could not attach uevent socket filter, filtering in userspace: %s", e)
+
+    def _grow_receive_buffer(self, sock):
+        """Enlarge the socket receive queue so bursts are not dropped by the kernel"""
+        try:
+            # Running as root, so FORCE may exceed net.core.rmem_max
+            sock.setsockopt(socket.SOL_SOCKET, getattr(socket, "SO_RCVBUFFORCE", 33), self.NETLINK_RCVBUF)
+        except OSError:
+            try:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.NETLINK_RCVBUF)
+            except OSError as e:
+                log.debug("Could not enlarge Netlink receive buffer: %s", e)
+
+    def _drain_uevents(self, sock):
+        """Read every queued uevent; return (power_supply seen, platform_profile seen)"""
+        power = profile = False
+        buf = self._ev_buf
+        while True:
+            # Receive event data into the reused buffer; searches are bounded to the n bytes received
+            try:
+                n = sock.recv_into(buf, 0, socket.MSG_DONTWAIT)
+            except BlockingIOError:
+                return power, profile
+            except OSError as e:
+                if e.errno != errno.ENOBUFS:
+                    raise
+                # The kernel dropped events; we can't know which, so re-check everything
+                log.warning("Netlink receive queue overflowed, re-checking power source and profile")
+                power = profile = True
+                continue
+            # Check for power supply events
+            if buf.find(b"SUBSYSTEM=power_supply", 0, n) != -1:
+                log.debug("Kernel Event: Power source change detected")
+                power = True
+            
+            # Check for thermal profile events (platform_profile)
+            if buf.find(b"platform_profile", 0, n) != -1:
+                log.debug("Kernel Event: Thermal profile change detected")
+                profile = True
+
     def _monitor_polling(self):
         """Fallback polling loop (Old method, slower but reliable)"""
         log.info("Starting fallback polling loop (1s interval)")
-        while self.running:
+        while not self._stop.is_set():
             self.check_power_source()
-            time.sleep(1)
+            self._stop.wait(1)
 
     def check_power_source(self):
         """Check current power source state and notify if changed"""
@@ -138,22 +253,38 @@ class PowerSourceDetector:
 
     def _is_ac_connected(self) -> bool:
         """Check if AC power is connected (Read from sysfs)"""
+        # Fast path: the adapter found last time
+        if self._ac_online_path:
+            try:
+                return _read_online(self._ac_online_path)
+            except OSError:
+                self._ac_online_path = None # Adapter node went away; probe again
+
         try:
             # Try known paths first
             for path in self.possible_power_supply_paths:
-                if os.path.exists(path):
-                    with open(path, 'r') as f:
-                        return f.read().strip() == "1"
+                try:
+                    online = _read_online(path)
+                except FileNotFoundError:
+                    continue
+                self._ac_online_path = path
+                return online
 
             # Fallback: Scan sysfs for any AC/ADP device
-            base = "/sys/class/power_supply"
-            if os.path.exists(base):
-                for item in os.listdir(base):
-                    if item.startswith("AC") or item.startswith("ADP"):
-                        path = os.path.join(base, item, "online")
-                        if os.path.exists(path):
-                            with open(path, 'r') as f:
-                                return f.read().strip() == "1"
+            try:
+                with os.scandir("/sys/class/power_supply") as it:
+                    for entry in it:
+                        if not entry.name.startswith(("AC", "ADP")):
+                            continue
+                        path = entry.path + "/online"
+                        try:
+                            online = _read_online(path)
+                        except OSError:
+                            continue
+                        self._ac_online_path = path
+                        return online
+            except FileNotFoundError:
+                pass
 
             return False
         except Exception as e:
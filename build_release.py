@@ -8,58 +8,215 @@ Note: This version DOES NOT include drivers. Drivers must be installed separatel
 
 import os
 import sys
+import fcntl
+import fnmatch
+import hashlib
+import json
 import subprocess
 import shutil
 import re
+import tempfile
+import threading
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
-def run_command(cmd, cwd='.', check=True):
-    """Run a command and exit if it fails."""
-    print(f"\n--- Running: {' '.join(cmd)} in {cwd} ---")
+_VERSION_RE = re.compile(r'<Version>([^<]+)</Version>')
+
+FICLONE = 0x40049409 # _IOW(0x94, 9, int) from linux/fs.h
+
+def fast_copy(src, dst):
+    """Copy a file with metadata like shutil.copy2, cloning it (reflink) when the filesystem allows.
+    Usable as a copytree copy_function."""
+    if os.path.isdir(dst):
+        dst = os.path.join(dst, os.path.basename(src))
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        try:
+            # Btrfs/XFS share the extents instead of copying the bytes
+            fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+        except OSError:
+            _copy_data(fsrc, fdst)
+    shutil.copystat(src, dst)
+    return dst
+
+def _copy_data(fsrc, fdst):
+    """Copy file contents in-kernel with copy_file_range, falling back to a userspace copy."""
+    copied = 0
     try:
-        result = subprocess.run(cmd, cwd=cwd, check=check, capture_output=True, text=True)
-        print(result.stdout)
-        if result.stderr:
-            print("Stderr:")
-            print(result.stderr)
-        return result
-    except FileNotFoundError as e:
+        while True:
+            n = os.copy_file_range(fsrc.fileno(), fdst.fileno(), 1 << 30)
+            if n == 0:
+                return
+            copied += n
+    except OSError:
+        # e.g. EXDEV on kernels without cross-filesystem support; continue where it stopped
+        fsrc.seek(copied)
+        fdst.seek(copied)
+        shutil.copyfileobj(fsrc, fdst)
+
+def _relay_output(stream, prefix):
+    """Copy a child's output to our stdout line by line as it arrives."""
+    with stream:
+        for line in iter(stream.readline, ''):
+            sys.stdout.write(prefix + line)
+            sys.stdout.flush()
+
+def run_command(cmd, cwd='.', check=True, background=False, tag=None):
+    """Run a command and exit if it fails.
+    With background=True, start it and return the Popen; pass that to wait_command() later.
+    Background output is streamed live, each line prefixed with [tag] so parallel builds stay readable."""
+    print(f"\n--- Running: {' '.join(cmd)} in {cwd} ---", flush=True)
+    try:
+        if background:
+            proc = subprocess.Popen(cmd, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                    text=True, bufsize=1)
+            # A reader thread keeps the pipe drained, so a chatty build never blocks on it
+            proc.relay = threading.Thread(target=_relay_output, args=(proc.stdout, f"[{tag}] " if tag else ""),
+                                          daemon=True)
+            proc.relay.start()
+            proc.check = check
+            return proc
+        # Output goes straight to our stdout/stderr instead of being buffered in memory
+        return subprocess.run(cmd, cwd=cwd, check=check)
+    except FileNotFoundError:
         print(f"Error: Command '{cmd[0]}' not found. Is it installed and in your PATH?")
         sys.exit(1)
     except subprocess.CalledProcessError as e:
         print(f"Error: Command failed with exit code {e.returncode}")
-        print(f"Stdout:\n{e.stdout}")
-        print(f"Stderr:\n{e.stderr}")
         sys.exit(1)
 
+def wait_command(proc):
+    """Wait for a background command to finish and exit if it failed."""
+    returncode = proc.wait()
+    proc.relay.join()
+    if proc.check and returncode != 0:
+        print(f"Error: Command failed with exit code {returncode}")
+        sys.exit(1)
+    return proc
+
 class ReleaseBuilder:
+    ICON_NAMES = frozenset({"icon.png", "iconTransparent.png"})
+
     def __init__(self):
         self.project_root = Path(__file__).parent.absolute()
         self.gui_dir = self.project_root / "AcerSense"
         self.daemon_dir = self.project_root / "Daemon"
         self.publish_dir = self.project_root / "Publish"
         self.setup_template = self.project_root / "scripts" / "setup_template.sh"
+        self.cache_dir = self.project_root / ".build-cache"
+
+        # Fixed inputs and build outputs, resolved once
+        self.csproj_path = self.gui_dir / "AcerSense.csproj"
+        self.gui_binary = self.gui_dir / "bin/Release/net9.0/linux-x64/publish" / "AcerSense"
+        self.daemon_script = self.daemon_dir / "AcerSense-Daemon.py"
+        self.daemon_binary = self.daemon_dir / "dist" / "AcerSense-Daemon"
+        self._pending_hashes = {}
 
         print(f"Project Root: {self.project_root}")
 
+    def preflight(self):
+        """Check tools and input files before starting any (long) build."""
+        missing = [f"'{tool}' not found in PATH" for tool in ("dotnet", "pyinstaller") if not shutil.which(tool)]
+        missing += [f"Missing file: {path}" for path in (self.csproj_path, self.daemon_script, self.setup_template)
+                    if not path.exists()]
+        if missing:
+            print("Error: Prerequisites not met:")
+            print("\n".join(f"  - {problem}" for problem in missing))
+            sys.exit(1)
+
+    def _inputs_hash(self, root, skip_dirs=(), patterns=None):
+        """SHA-256 over every file under root (plus this script), in a stable order.
+        With patterns, only file names matching one of the globs are included."""
+        digest = hashlib.sha256()
+        files = [Path(__file__).absolute()]
+        for dirpath, dirnames, filenames in os.walk(root):
+            # Prune build outputs and caches so our own artifacts don't invalidate the hash
+            dirnames[:] = sorted(d for d in dirnames if d not in skip_dirs and not d.startswith('.'))
+            files.extend(Path(dirpath, name) for name in sorted(filenames)
+                         if patterns is None or any(fnmatch.fnmatch(name, p) for p in patterns))
+        for path in files:
+            digest.update(str(path.relative_to(self.project_root)).encode() + b'\0')
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(65536), b''):
+                    digest.update(chunk)
+        return digest.hexdigest()
+
+    def _is_up_to_date(self, name, digest, output):
+        """True if output exists and was built from inputs with this digest."""
+        try:
+            return output.exists() and (self.cache_dir / f"{name}.hash").read_text() == digest
+        except FileNotFoundError:
+            return False
+
+    def save_build_hashes(self):
+        """Record input hashes of builds that finished successfully."""
+        self.cache_dir.mkdir(exist_ok=True)
+        for name, digest in self._pending_hashes.items():
+            hash_file = self.cache_dir / f"{name}.hash"
+            tmp_file = hash_file.with_suffix('.tmp')
+            tmp_file.write_text(digest)
+            os.replace(tmp_file, hash_file)
+        self._pending_hashes.clear()
+
     def get_version(self):
         """Get version from csproj file."""
-        csproj_path = self.gui_dir / "AcerSense.csproj"
+        version = None
         try:
-            with open(csproj_path, 'r') as f:
-                content = f.read()
-            match = re.search(r'<Version>(.*?)<\/Version>', content)
-            if match:
-                version = match.group(1)
-                print(f"Detected version: {version}")
-                return version
+            version = self._cached_version()
         except FileNotFoundError:
             pass
+        if version:
+            print(f"Detected version: {version}")
+            return version
         print("Warning: Could not detect version. Using '1.0.0'.")
         return "1.0.0"
 
-    def build_gui(self):
+    def _cached_version(self):
+        """_read_version() result, reused while the csproj's mtime and size are unchanged."""
+        st = self.csproj_path.stat()
+        key = [st.st_mtime_ns, st.st_size]
+        cache_file = self.cache_dir / "version.json"
+        try:
+            data = json.loads(cache_file.read_text())
+            if data["key"] == key:
+                return data["version"]
+        except (OSError, ValueError, KeyError, TypeError):
+            pass # Missing or unreadable cache; parse again
+
+        version = self._read_version(self.csproj_path)
+        try:
+            self.cache_dir.mkdir(exist_ok=True)
+            tmp_file = cache_file.with_suffix('.tmp')
+            tmp_file.write_text(json.dumps({"key": key, "version": version}))
+            os.replace(tmp_file, cache_file)
+        except OSError as e:
+            print(f"Warning: Could not cache version: {e}")
+        return version
+
+    @staticmethod
+    def _read_version(csproj_path):
+        """First <Version> element of the project, as MSBuild sees it (comments and attributes ignored)."""
+        try:
+            # Streaming parse stops at the first match; handles the BOM Visual Studio writes
+            for _, elem in ET.iterparse(csproj_path, events=('end',)):
+                if elem.tag.rpartition('}')[2] == 'Version' and elem.text and elem.text.strip():
+                    return elem.text.strip()
+            return None
+        except ET.ParseError:
+            # Not well-formed XML; fall back to a plain text search
+            match = _VERSION_RE.search(csproj_path.read_text(encoding='utf-8-sig'))
+            return match.group(1).strip() if match else None
+
+    def build_gui(self, background=False):
         print("\n=== Building GUI ===")
+        # Trimming is opt-in: Avalonia relies on reflection that the trimmer can break
+        trim = os.environ.get("ACERSENSE_TRIM") == "1"
+        digest = self._inputs_hash(self.gui_dir, skip_dirs=("bin", "obj")) + ("-trimmed" if trim else "")
+        if self._is_up_to_date("gui", digest, self.gui_binary):
+            print("GUI up-to-date, skipping build.")
+            return None
+
         cmd = [
             "dotnet", "publish",
             "-c", "Release",
@@ -68,19 +225,49 @@ class ReleaseBuilder:
             "--self-contained", "true",
             "/p:PublishSingleFile=true",
             "/p:IncludeNativeLibrariesForSelfExtract=true",
-            "/p:IncludeAllContentForSelfExtract=true"
+            "/p:IncludeAllContentForSelfExtract=true",
+            # Precompile to native code (faster startup for users); dynamic PGO then tunes hot paths
+            "/p:PublishReadyToRun=true",
+            "/p:TieredPGO=true"
         ]
-        run_command(cmd, cwd=self.gui_dir)
+        if trim:
+            cmd += ["/p:PublishTrimmed=true", "/p:TrimMode=partial"]
+        proc = run_command(cmd, cwd=self.gui_dir, background=background, tag="gui")
+        self._pending_hashes["gui"] = digest
+        if not background:
+            self.save_build_hashes()
+        return proc
 
-    def build_daemon(self):
+    def build_daemon(self, background=False):
         print("\n=== Building Daemon ===")
-        daemon_script = self.daemon_dir / "AcerSense-Daemon.py"
+        daemon_script = self.daemon_script
         if not daemon_script.exists():
             print(f"Error: Could not find daemon script in {self.daemon_dir}")
             sys.exit(1)
 
-        cmd = ["pyinstaller", "--onefile", "--clean", daemon_script.name]
-        run_command(cmd, cwd=self.daemon_dir)
+        # Not the .spec: building from the script name makes PyInstaller rewrite it every run
+        digest = self._inputs_hash(self.daemon_dir, skip_dirs=("build", "dist", "__pycache__"),
+                                   patterns=("*.py", "pyinstaller_config.txt"))
+        if self._is_up_to_date("daemon", digest, self.daemon_binary):
+            print("Daemon up-to-date, skipping build.")
+            return None
+
+        # Keep PyInstaller's work files in tmpfs between runs so its analysis cache is reused;
+        # only start clean when there is no record of a previous successful build
+        tmp_root = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+        cmd = [
+            "pyinstaller", "--onefile",
+            "--workpath", os.path.join(tmp_root, "acersense-daemon-build"),
+            "--distpath", str(self.daemon_binary.parent),
+            daemon_script.name
+        ]
+        if not (self.cache_dir / "daemon.hash").exists():
+            cmd.insert(1, "--clean")
+        proc = run_command(cmd, cwd=self.daemon_dir, background=background, tag="daemon")
+        self._pending_hashes["daemon"] = digest
+        if not background:
+            self.save_build_hashes()
+        return proc
 
     def assemble_package(self, version):
         print(f"\n=== Assembling Package v{version} ===")
@@ -88,42 +275,52 @@ class ReleaseBuilder:
 
         if package_dir.exists():
             print(f"Removing existing package directory: {package_dir}")
-            shutil.rmtree(package_dir)
+            # Renaming is instant; the actual delete runs alongside the copies below.
+            # Not a daemon thread, so the interpreter waits for it instead of leaving the trash behind.
+            trash = package_dir.with_name(f"{package_dir.name}.trash.{os.getpid()}")
+            os.rename(package_dir, trash)
+            threading.Thread(target=shutil.rmtree, args=(trash,), kwargs={'ignore_errors': True}).start()
         
         print(f"Creating package structure in: {package_dir}")
         gui_target = package_dir / "AcerSense-GUI"
         daemon_target = package_dir / "AcerSense-Daemon"
         
+        # Create the whole skeleton up front so the copy workers never race on mkdir
         gui_target.mkdir(parents=True)
         daemon_target.mkdir(parents=True)
 
+        # (source, destination, message once copied); the copies are independent and IO-bound
+        copies = []
+
         # 1. Copy Setup Script
         if self.setup_template.exists():
-            shutil.copy2(self.setup_template, package_dir / "setup.sh")
-            print("Copied setup script.")
+            copies.append((self.setup_template, package_dir / "setup.sh", "Copied setup script."))
         else:
             print("Error: setup_template.sh not found. Package will be incomplete.")
 
         # 2. Copy GUI
-        gui_source_dir = self.gui_dir / "bin/Release/net9.0/linux-x64/publish"
-        if (gui_source_dir / "AcerSense").exists():
-            shutil.copy2(gui_source_dir / "AcerSense", gui_target / "AcerSense")
-            for icon_name in ["icon.png", "iconTransparent.png"]:
-                icon_path = self.gui_dir / icon_name
-                if icon_path.exists():
-                    shutil.copy2(icon_path, gui_target)
-            print("Copied GUI and icons.")
+        if self.gui_binary.exists():
+            copies.append((self.gui_binary, gui_target / "AcerSense", "Copied GUI."))
+            # One directory read finds whichever icons exist, instead of a stat per name
+            with os.scandir(self.gui_dir) as entries:
+                copies.extend((entry.path, gui_target / entry.name, f"Copied {entry.name}.")
+                              for entry in entries if entry.name in self.ICON_NAMES and entry.is_file())
         else:
             print("Error: Compiled GUI not found.")
 
         # 3. Copy Daemon
-        daemon_dist = self.daemon_dir / "dist" / "AcerSense-Daemon"
-        if daemon_dist.exists():
-            shutil.copy2(daemon_dist, daemon_target / "AcerSense-Daemon")
-            print("Copied Daemon.")
+        if self.daemon_binary.exists():
+            copies.append((self.daemon_binary, daemon_target / "AcerSense-Daemon", "Copied Daemon."))
         else:
             print("Error: Compiled Daemon not found.")
 
+        if copies:
+            with ThreadPoolExecutor(max_workers=min(8, len(copies))) as pool:
+                futures = {pool.submit(fast_copy, src, dst): message for src, dst, message in copies}
+                for future in as_completed(futures):
+                    future.result() # Re-raise the first copy error
+                    print(futures[future])
+
         # 4. Ensure setup script is executable
         (package_dir / "setup.sh").chmod(0o755)
 
@@ -131,19 +328,31 @@ class ReleaseBuilder:
         release_info = f"""AcerSense Release Information
 ========================
 Version: {version}
-Build Date: {subprocess.check_output(['date'], text=True).strip()}
+Build Date: {datetime.now(timezone.utc).isoformat(timespec='seconds')}
 """
-        with open(package_dir / "release.txt", 'w') as f:
+        # Write to a temp name and rename, so an interrupted build never leaves a truncated release.txt
+        release_file = package_dir / "release.txt"
+        tmp_file = release_file.with_suffix('.tmp')
+        with open(tmp_file, 'w') as f:
             f.write(release_info)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, release_file)
 
         print(f"\n🎉 Successfully created release package at: {package_dir}")
 
 
 def main():
     builder = ReleaseBuilder()
+    builder.preflight()
     version = builder.get_version()
-    builder.build_gui()
-    builder.build_daemon()
+    # GUI and daemon builds are independent, so run them side by side
+    builds = [b for b in (builder.build_gui(background=True), builder.build_daemon(background=True)) if b]
+    for build in builds:
+        build.wait() # Let both finish before a failure exits the script
+    for build in builds:
+        wait_command(build)
+    builder.save_build_hashes()
     builder.assemble_package(version)
 
 if __name__ == "__main__":